@@ -14,9 +14,14 @@ Use the AI to simmulate a fasta file for the input
 
 """
 
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, scrolledtext
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import read_fasta_sequence
+
 
 def exercise_one_logic(sequence):
     """Counts occurrences of each letter in the sequence."""
@@ -46,13 +51,8 @@ def exercise_two_logic(sequence):
 
 
 def read_fasta_file(filepath):
-    """Reads a FASTA file and returns only the sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    
-    # First line is header, rest is sequence
-    sequence = "".join(line.strip() for line in lines[1:])
-    return sequence
+    """Reads a FASTA file and returns only the sequence (ignoring headers)."""
+    return read_fasta_sequence(filepath)
 
 
 def load_fasta():
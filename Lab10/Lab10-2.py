@@ -10,7 +10,12 @@ with the name and variant of the virus.
 """
 import matplotlib.pyplot as plt
 import os
-import glob
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.batch import find_fasta_files, run_batch
+from bioutils.cache import cached_analysis
+from bioutils.fasta import fasta_label, read_fasta_sequence
 
 
 def get_counts(seq):
@@ -44,21 +49,10 @@ def calculate_ic(counts):
 
 
 def read_fasta_file(filepath):
-    filename = os.path.basename(filepath)
-    
-    label = os.path.splitext(filename)[0]
-    
-    sequence = []
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                continue
-            sequence.append(line)
+    # works for plain, .gz and BGZF files
+    label = fasta_label(filepath)
     
-    return label, "".join(sequence)
+    return label, read_fasta_sequence(filepath)
 
 def analyze_sequence_data(sequence, window_size=30):
     
@@ -89,7 +83,17 @@ def analyze_sequence_data(sequence, window_size=30):
         
     return x_values, y_values, avg_cg, avg_ic
 
-def process_folders(base_folders, window_size):
+def analyze_file(filepath, window_size):
+    # runs in a worker process; repeated runs on the same file come from the cache
+    def compute():
+        label, seq = read_fasta_file(filepath)
+        x, y, cx, cy = analyze_sequence_data(seq, window_size)
+        return {'x': x, 'y': y, 'cx': cx, 'cy': cy}
+
+    result = cached_analysis(filepath, "cg_ic", compute, window_size=window_size)
+    return fasta_label(filepath), result['x'], result['y'], float(result['cx']), float(result['cy'])
+
+def process_folders(base_folders, window_size, workers=None):
     dataset = []
     
     for folder in base_folders:
@@ -97,18 +101,18 @@ def process_folders(base_folders, window_size):
             print(f"Warning: Folder '{folder}' not found. Skipping.")
             continue
             
-        files = glob.glob(os.path.join(folder, "*.fasta")) + \
-                glob.glob(os.path.join(folder, "*.fna")) + \
-                glob.glob(os.path.join(folder, "*.txt"))
+        files = find_fasta_files(folder)
         
         print(f"Processing folder '{folder}': Found {len(files)} files.")
         
-        for filepath in files:
-            label, seq = read_fasta_file(filepath)
-            
-            x, y, cx, cy = analyze_sequence_data(seq, window_size)
+        for filepath, result, seconds, error in run_batch(files, analyze_file, window_size, workers=workers):
+            if error is not None:
+                print(f"  -> Error in {filepath}: {error}")
+                continue
+
+            label, x, y, cx, cy = result
             
-            if x:
+            if len(x):
                 dataset.append({
                     'label': label,
                     'group': folder,
@@ -117,7 +121,7 @@ def process_folders(base_folders, window_size):
                     'cx': cx,
                     'cy': cy
                 })
-                print(f"  -> Analyzed {label} ({len(x)} windows)")
+                print(f"  -> Analyzed {label} ({len(x)} windows) in {seconds:.2f} s")
                 
     return dataset
 
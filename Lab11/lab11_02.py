@@ -15,16 +15,17 @@
 
     Note: please do not use the shortcuts given by AI (use native code)
 """
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import read_fasta_sequence
+
 def read_fasta(filename):
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-        
-        sequence = "".join([line.strip() for line in lines if not line.startswith(">")])
-        return sequence.upper()
+        return read_fasta_sequence(filename).upper()
     except FileNotFoundError:
         print(f"Error: The file '{filename}' was not found.")
         return ""
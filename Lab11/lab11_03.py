@@ -6,12 +6,15 @@ Implement each of the scoring equations in your current implementation.
 import numpy as np
 import matplotlib.pyplot as plt
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import read_fasta_sequence
 
 def read_fasta(filename):
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-        return "".join([line.strip() for line in lines if not line.startswith(">")]).upper()
+        return read_fasta_sequence(filename).upper()
     except FileNotFoundError:
         print(f"Error: {filename} not found.")
         return ""
@@ -4,8 +4,16 @@ with most likely locations of realfunctional motives"""
 
 import math
 import os
+import sys
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from bioutils.batch import find_fasta_files, run_batch
+from bioutils.cache import cached_analysis
+from bioutils.fasta import read_fasta_sequence
+from bioutils.intervals import signal_intervals
+from bioutils.lod import plot_lod
+
 
 training_sequences = [
     "GAGGTAAAC", 
@@ -79,28 +87,32 @@ def scan_genome(sequence, pwm):
 
 
 
-def read_genomes_from_folder(folder):
+def scan_genome_file(filepath, pwm):
+    # runs in a worker process: read one genome and scan it (or take the cached scan)
+    def compute():
+        seq = read_fasta_sequence(filepath).upper()
+        return {'length': len(seq), 'scores': scan_genome(seq, pwm) if seq else []}
+
+    result = cached_analysis(filepath, "pwm_scan", compute, pwm=pwm)
+    return int(result['length']), result['scores'].tolist()
+
+
+def scan_genomes_in_folder(folder, pwm, workers=None):
+    """Scans every genome of the folder in parallel, yielding results as they finish."""
 
-    genomes = {}
-    
-   
     if not os.path.exists(folder):
         print(f"Directory '{folder}' not found. Please create it and add files.")
-        return genomes
+        return
 
-    for filename in os.listdir(folder):
-        filepath = os.path.join(folder, filename)
-        if os.path.isfile(filepath):
-            try:
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-                   
-                    seq = "".join([line.strip() for line in lines if not line.startswith(">")]).upper()
-                    if seq:
-                        genomes[filename] = seq
-            except Exception as e:
-                print(f"Error reading {filename}: {e}")
-    return genomes
+    files = find_fasta_files(folder)
+    for filepath, result, seconds, error in run_batch(files, scan_genome_file, pwm, workers=workers):
+        filename = os.path.basename(filepath)
+        if error is not None:
+            print(f"Error reading {filename}: {error}")
+            continue
+        length, scores = result
+        if scores:
+            yield filename, length, scores, seconds
 
 
 
@@ -109,9 +121,9 @@ def plot_signal(scores, filename):
     Plots the score signal across the genome.
     """
     plt.figure(figsize=(12, 6))
-    x_axis = range(len(scores))
-    
-    plt.plot(x_axis, scores, label='Motif Score', color='blue', linewidth=1)
+
+    # a genome-length signal is drawn at about one point per pixel, refined on zoom
+    plot_lod(plt.gca(), None, scores, label='Motif Score', color='blue', linewidth=1)
     
    
     plt.axhline(y=0, color='r', linestyle='--', label='Threshold (0)')
@@ -126,6 +138,28 @@ def plot_signal(scores, filename):
     plt.show()
 
 
+def report_scan(name, length, scores):
+    print(f"\nProcessing {name} (Length: {length} bp)...")
+
+    max_score = max(scores)
+    max_pos = scores.index(max_score)
+    
+    print(f" -> Max Signal found at position {max_pos} with score {max_score:.4f}")
+    
+    if max_score > 0:
+        print(" -> CONCLUSION: Strong candidate motif found.")
+        regions = signal_intervals(scores, 0)
+        strongest = regions[regions["max"].argsort()[::-1][:10]]
+        print(f" -> {len(regions)} regions above the threshold (0), strongest:")
+        for region in strongest:
+            print(f"    [{region['start']}:{region['end']}] max = {region['max']:.4f}, mean = {region['mean']:.4f}")
+    else:
+        print(" -> CONCLUSION: No strong motif found.")
+        
+
+    plot_signal(scores, name)
+
+
 def main():
 
     print("Building Motif Model...")
@@ -135,34 +169,25 @@ def main():
     print("Model Built.")
 
 
-    print(f"Reading genomes from {FOLDER_PATH}...")
-    genomes = read_genomes_from_folder(FOLDER_PATH)
+    print(f"Scanning genomes from {FOLDER_PATH}...")
+    found_genomes = False
+
+    # genomes are scanned in worker processes; each one is shown as soon as it is done
+    for name, length, scores, seconds in scan_genomes_in_folder(FOLDER_PATH, pwm):
+        found_genomes = True
+        print(f"\n{name} scanned in {seconds:.2f} s")
+        report_scan(name, length, scores)
     
-    if not genomes:
+    if not found_genomes:
         print("No genomes found. (Did you create the folder and add files?)")
       
         print("\n--- RUNNING ON DUMMY DATA FOR DEMO ---")
+        genomes = {}
         genomes["Dummy_Influenza_1"] = "ATCG" * 50 + "CAGGTTGGA" + "ATCG" * 50 
         genomes["Dummy_Influenza_2"] = "GGGG" * 50 + "ACAGTCAGT" + "AAAA" * 50 
 
-
-    for name, seq in genomes.items():
-        print(f"\nProcessing {name} (Length: {len(seq)} bp)...")
-        scores = scan_genome(seq, pwm)
-        
-
-        max_score = max(scores)
-        max_pos = scores.index(max_score)
-        
-        print(f" -> Max Signal found at position {max_pos} with score {max_score:.4f}")
-        
-        if max_score > 0:
-            print(" -> CONCLUSION: Strong candidate motif found.")
-        else:
-            print(" -> CONCLUSION: No strong motif found.")
-            
-
-        plot_signal(scores, name)
+        for name, seq in genomes.items():
+            report_scan(name, len(seq), scan_genome(seq, pwm))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
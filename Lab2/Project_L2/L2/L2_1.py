@@ -17,45 +17,20 @@ Definition: A trinucleotide is a sequence of three nucleotides. 4 **3 = 64 uniqu
 """
 
 
-S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGAGG"
-gen_alphabet =  {"A", "C", "G", "T"}
-dinucleoids = {}
-trinucleoids = {}
-total_dn = 0
-total_tn = 0
-dinucleoids_perc = {}
-trinucleoids_perc= {}
-
-for n1 in gen_alphabet:
-    for n2 in gen_alphabet:
-        d = n1+n2
-        dinucleoids[d] = 0
-
-
-for n1 in gen_alphabet:
-    for n2 in gen_alphabet:
-        for n3 in gen_alphabet:
-            t = n1+n2+n3
-            trinucleoids[t] = 0
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from bioutils.kmers import kmer_percentages
 
-for d in  dinucleoids.keys():
-    if d in S:
-        dinucleoids[d] = S.count(d)
-        total_dn += dinucleoids[d]
-
+S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGAGG"
 
-for d in dinucleoids.keys():
-    dinucleoids_perc[d] = round(dinucleoids[d] / total_dn * 100.0, 2)
+# every one of the 4**2 / 4**3 combinations is listed, including those that never occur;
+# occurrences are counted with overlaps (S.count() used to skip overlapping ones)
+dinucleoids_perc = kmer_percentages(S, 2, include_missing=True)
 #print(f"Number of instances of dinucleoids in sequece S: {dinucleoids}")
 print(f"Number of instances of dinucleoids percentage in sequece S: {dinucleoids_perc}")
 
-for t in  trinucleoids.keys():
-    if t in S:
-        trinucleoids[t] = S.count(t)
-        total_tn += trinucleoids[t]
-
-for t in trinucleoids.keys():
-    trinucleoids_perc[t] = round(trinucleoids[t] / total_tn * 100.0, 2)
+trinucleoids_perc = kmer_percentages(S, 3, include_missing=True)
 #print(f"Number of instances of trinucleoids in sequece S: {trinucleoids}")
 print(f"Number of instances of trinucleoids percentage in sequece S: {trinucleoids_perc}")
\ No newline at end of file
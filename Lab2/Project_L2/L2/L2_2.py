@@ -4,18 +4,19 @@ without the use of bruteforce engine. In order to achieve the results
 one must verify this combination starting from the begining
 """
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from bioutils.kmers import kmer_count_dict
+
 S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
-dinucleoids = {}
-trinucleoids = {}
 
-for i in range(len(S)-1):
-    dinucleoids[S[i:i+2]] = dinucleoids.get(S[i:i+2], 0) + 1
-# dinucleoids = {S[i:i+2]: S.count(S[i:i+2]) for i in range(len(S) - 1)} # because I python can
+# only the k-mers that occur in S are reported
+dinucleoids = kmer_count_dict(S, 2)
 print(dinucleoids)
 
 
-for i in range(len(S)- 2):
-    trinucleoids[S[i:i+3]]= trinucleoids.get(S[i:i+3], 0) + 1
-# trinucleoids = {S[i:i+3]: S.count(S[i:i+2]) for i in range(len(S) - 2)}
+trinucleoids = kmer_count_dict(S, 3)
 
-print(trinucleoids)
\ No newline at end of file
+print(trinucleoids)
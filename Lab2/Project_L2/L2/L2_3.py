@@ -9,71 +9,61 @@
 
 
 
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, scrolledtext
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from bioutils.composition import window_frequencies
+from bioutils.kmers import kmer_percentages
+from bioutils.lod import plot_lod
+from bioutils.store import open_genome_store
+
 WINDOW_SIZE = 30
 
 def read_fasta_file(filepath):
-    """Reads a FASTA file and returns only the sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    sequence = "".join(line.strip() for line in lines[1:])
-    return sequence
+    """Returns the codes 0-4 of the sequence (all records joined).
+
+    The codes come from the .2bit store kept next to the FASTA file, so a file
+    that was opened before is not parsed again.
+    """
+    with open_genome_store(filepath) as store:
+        return store.joined_codes()
+
+def show_sequence(filepath):
+    """Writes the sequence into the text box, decoding one record at a time."""
+    with open_genome_store(filepath) as store:
+        for name in store.names:
+            text_box.insert(tk.END, store.sequence(name))
 
 def sliding_window_frequencies(sequence):
-    """Calculate relative frequencies per sliding window."""
-    alphabet = sorted(set(sequence))
-    freqs = {letter: [] for letter in alphabet}
-    
-    for i in range(len(sequence) - WINDOW_SIZE + 1):
-        window = sequence[i:i+WINDOW_SIZE]
-        total = len(window)
-        count_dict = {}
-        for s in window:
-            count_dict[s] = count_dict.get(s, 0) + 1
-        for letter in alphabet:
-            freqs[letter].append(count_dict.get(letter, 0)/total)
-    
-    return freqs
+    """Calculate relative frequencies per sliding window (one array per symbol)."""
+    alphabet, matrix = window_frequencies(sequence, WINDOW_SIZE)
+    return {letter: matrix[row] for row, letter in enumerate(alphabet)}
 
 def plot_frequencies(freqs):
     """Plot the relative frequencies for each symbol."""
     plt.figure(figsize=(10, 6))
-    x = range(len(next(iter(freqs.values()))))
+    ax = plt.gca()
+    # only about one point per pixel is drawn; zooming in redraws the finer detail
     for letter, values in freqs.items():
-        plt.plot(x, values, label=letter)
+        plot_lod(ax, None, values, label=letter)
     plt.xlabel("Window Start Position")
     plt.ylabel("Relative Frequency")
     plt.title("Sliding Window Symbol Frequencies")
     plt.legend()
     plt.show()
 
-def count_di_tri(sequence):
-    """Count dinucleotides and trinucleotides with brute force."""
-    dinucleoids = {}
-    trinucleoids = {}
-    
-    for i in range(len(sequence)-1):
-        dinuc = sequence[i:i+2]
-        dinucleoids[dinuc] = dinucleoids.get(dinuc, 0) + 1
-    for i in range(len(sequence)-2):
-        trinuc = sequence[i:i+3]
-        trinucleoids[trinuc] = trinucleoids.get(trinuc, 0) + 1
-
+def count_di_tri(sequence, canonical=False):
+    """Percentages of the dinucleotides and trinucleotides found in the sequence.
 
-    total_dn = 0
-    total_tn = 0
-
-    for d in dinucleoids.keys():
-        total_dn += dinucleoids[d]
-
-    for t in trinucleoids.keys():
-        total_tn += trinucleoids[t]
-
-    dinuc_perc = {d: round(dinucleoids[d]/total_dn*100, 2) for d in dinucleoids}
-    trinuc_perc = {t: round(trinucleoids[t]/total_tn*100, 2) for t in trinucleoids}
+    With canonical=True each k-mer is merged with its reverse complement, so
+    genomes sequenced in opposite orientations give the same table.
+    """
+    dinuc_perc = kmer_percentages(sequence, 2, canonical=canonical)
+    trinuc_perc = kmer_percentages(sequence, 3, canonical=canonical)
     return dinuc_perc, trinuc_perc
 
 def load_fasta():
@@ -82,13 +72,15 @@ def load_fasta():
         filetypes=(("FASTA files", "*.fasta *.fa"), ("All files", "*.*"))
     )
     if filepath:
-        sequence = read_fasta_file(filepath)
-        dinuc, trinuc = count_di_tri(sequence)
-        freqs = sliding_window_frequencies(sequence)
+        codes = read_fasta_file(filepath)
+        dinuc, trinuc = count_di_tri(codes, canonical=both_strands.get())
+        freqs = sliding_window_frequencies(codes)
         
         # Display text output
         text_box.delete(1.0, tk.END)
-        text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
+        text_box.insert(tk.END, "FASTA Sequence:\n")
+        show_sequence(filepath)
+        text_box.insert(tk.END, "\n\n")
         text_box.insert(tk.END, "Dinucleotide counts:\n")
         for k, v in sorted(dinuc.items()):
             text_box.insert(tk.END, f"{k}: {v}\n")
@@ -106,6 +98,9 @@ root.title("FASTA Analyzer")
 btn = tk.Button(root, text="Load FASTA File", command=load_fasta)
 btn.pack(pady=10)
 
+both_strands = tk.BooleanVar(value=False)
+tk.Checkbutton(root, text="Count both strands (canonical k-mers)", variable=both_strands).pack()
+
 text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=80, height=25)
 text_box.pack(padx=10, pady=10)
 
@@ -21,6 +21,11 @@ Output = temperature in celsius
 """
 
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.melting import melting_temperature_nearest_neighbor
 
 #S1 = "TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
 
@@ -62,5 +67,9 @@ def main():
     Tm2, string2 = melting_temperature_alternative(CG_perc, len(S))
     print(f"By using the formula: Tm = 81.5 + 16.6(log10([Na+])) + .41*(%GC) - 600/length we obtain Tm= {string2}")
 
+    # the two formulas above only look at composition; this one also accounts for base stacking
+    Tm3 = melting_temperature_nearest_neighbor(S)
+    print(f"By using the nearest-neighbor model (SantaLucia 1998, 50 mM Na+) we obtain Tm= {Tm3:.2f} °C")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
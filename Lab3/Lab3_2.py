@@ -7,73 +7,41 @@
 
 """
 
-import math
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, scrolledtext
 import matplotlib.pyplot as plt
 
-
-Na_plus = 0.001  # Fixed sodium concentration
-
-
-def melting_temperature_simple(G: int, C: int, A: int, T: int):
-    """Simple formula for melting temperature."""
-    return 4 * (G + C) + 2 * (A + T)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.cache import cached_analysis
+from bioutils.fasta import read_fasta_sequence
+from bioutils.lod import plot_lod
+from bioutils.melting import tm_profile
 
 
-def melting_temperature_alternative(CG_perc, length):
-    """Alternative formula for melting temperature."""
-    return 81.5 + 16.6 * math.log10(Na_plus) + 0.41 * (CG_perc) - 600 / length
+Na_plus = 0.001  # Fixed sodium concentration
+WINDOW_SIZE = 9
 
 
 def read_fasta_file(filepath):
     """Reads a FASTA file and returns only the DNA sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    # Skip header lines starting with '>'
-    sequence = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return sequence.upper()
-
-
-def sliding_window(sequence, window_size=9):
-    """Yields each window substring of length window_size."""
-    for i in range(len(sequence) - window_size + 1):
-        yield sequence[i:i + window_size]
+    return read_fasta_sequence(filepath).upper()
 
 
-def compute_tm_for_sequence(sequence):
-    """Computes melting temperature arrays using sliding window."""
-    window_size = 9
-    tm_simple_values = []
-    tm_alt_values = []
-    positions = []
-
-    for i, window in enumerate(sliding_window(sequence, window_size)):
-        G = window.count('G')
-        C = window.count('C')
-        A = window.count('A')
-        T = window.count('T')
-
-        # Simple formula
-        tm1 = melting_temperature_simple(G, C, A, T)
-        tm_simple_values.append(tm1)
-
-        # Alternative formula
-        CG_perc = (C + G) / window_size * 100
-        tm2 = melting_temperature_alternative(CG_perc, window_size)
-        tm_alt_values.append(tm2)
-
-        positions.append(i + 1)
-
-    return positions, tm_simple_values, tm_alt_values
+def compute_tm_for_sequence(sequence, window_size=WINDOW_SIZE, step=1):
+    """Computes melting temperature arrays for every window (prefix sums, no Python loop)."""
+    profile = tm_profile(sequence, window_size, step, Na_plus)
+    return profile["positions"], profile["simple"], profile["alternative"]
 
 
 def plot_tm_chart(positions, tm_simple, tm_alt):
     """Displays a chart with both Tm signals."""
     plt.figure(figsize=(10, 5))
-    plt.plot(positions, tm_simple, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
-    plt.plot(positions, tm_alt, label="Tm Alternative 81.5+16.6(log10([Na+]))+0.41*(%GC)-600/length", color='red')
-    plt.title("DNA Melting Temperature along Sequence (Sliding Window = 9)")
+    ax = plt.gca()
+    plot_lod(ax, positions, tm_simple, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
+    plot_lod(ax, positions, tm_alt, label="Tm Alternative 81.5+16.6(log10([Na+]))+0.41*(%GC)-600/length", color='red')
+    plt.title(f"DNA Melting Temperature along Sequence (Sliding Window = {WINDOW_SIZE})")
     plt.xlabel("Position in Sequence")
     plt.ylabel("Melting Temperature (°C)")
     plt.legend()
@@ -92,11 +60,17 @@ def analyze_fasta():
         text_box.delete(1.0, tk.END)
         text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
 
-        if len(sequence) < 9:
-            text_box.insert(tk.END, "Error: Sequence too short for 9-position sliding window.")
+        if len(sequence) < WINDOW_SIZE:
+            text_box.insert(tk.END, f"Error: Sequence too short for {WINDOW_SIZE}-position sliding window.")
             return
 
-        positions, tm_simple, tm_alt = compute_tm_for_sequence(sequence)
+        def compute():
+            positions, tm_simple, tm_alt = compute_tm_for_sequence(sequence)
+            return {"positions": positions, "tm_simple": tm_simple, "tm_alt": tm_alt}
+
+        # reloading the same file returns the cached signals
+        tm = cached_analysis(filepath, "tm", compute, window_size=WINDOW_SIZE, na_plus=Na_plus)
+        positions, tm_simple, tm_alt = tm["positions"], tm["tm_simple"], tm["tm_alt"]
 
         # Display results in text box
         text_box.insert(tk.END, f"Computed {len(tm_simple)} windows.\n")
@@ -5,51 +5,33 @@
 # Thus, the chunks of the signal that are above the threshold are shown as a horizontal bar over the signal. 
 # Whenever the signal is below the threshold, the chart should show empty space.
 """
-import math
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, scrolledtext
 import matplotlib.pyplot as plt
 import numpy as np
 
-Na_plus = 0.001  # Fixed sodium concentration
-
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.cache import cached_analysis
+from bioutils.fasta import read_fasta_sequence
+from bioutils.intervals import signal_intervals
+from bioutils.lod import plot_lod
+from bioutils.melting import tm_profile
 
-def melting_temperature_simple(G: int, C: int, A: int, T: int):
-    """Simple formula for melting temperature."""
-    return 4 * (G + C) + 2 * (A + T)
+Na_plus = 0.001  # Fixed sodium concentration
+WINDOW_SIZE = 9
 
 
 def read_fasta_file(filepath):
     """Reads a FASTA file and returns only the DNA sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    sequence = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return sequence.upper()
-
-
-def sliding_window(sequence, window_size=9):
-    """Yields each window substring of length window_size."""
-    for i in range(len(sequence) - window_size + 1):
-        yield sequence[i:i + window_size]
+    return read_fasta_sequence(filepath).upper()
 
 
-def compute_tm_for_sequence(sequence):
-    """Computes melting temperature array using sliding window."""
-    window_size = 9
-    tm_values = []
-    positions = []
-
-    for i, window in enumerate(sliding_window(sequence, window_size)):
-        G = window.count('G')
-        C = window.count('C')
-        A = window.count('A')
-        T = window.count('T')
-
-        tm = melting_temperature_simple(G, C, A, T)
-        tm_values.append(tm)
-        positions.append(i + 1)
-
-    return positions, tm_values
+def compute_tm_for_sequence(sequence, window_size=WINDOW_SIZE, step=1):
+    """Computes the simple-formula Tm array for every window (prefix sums, no Python loop)."""
+    profile = tm_profile(sequence, window_size, step, Na_plus)
+    return profile["positions"], profile["simple"]
 
 
 def plot_tm_chart(positions, tm_values, threshold=None):
@@ -57,8 +39,8 @@ def plot_tm_chart(positions, tm_values, threshold=None):
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10), sharex=True, sharey=True)
 
     # === Top Chart: Full signal ===
-    ax1.plot(positions, tm_values, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
-    ax1.set_title("DNA Melting Temperature along Sequence (Sliding Window = 9)")
+    plot_lod(ax1, positions, tm_values, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
+    ax1.set_title(f"DNA Melting Temperature along Sequence (Sliding Window = {WINDOW_SIZE})")
     ax1.set_xlabel("Position in Sequence")
     ax1.set_ylabel("Melting Temperature (°C)")
     if threshold is not None:
@@ -68,20 +50,13 @@ def plot_tm_chart(positions, tm_values, threshold=None):
 
     # === Bottom Chart: Highlight regions above threshold ===
     if threshold is not None:
-        above = np.array(tm_values) > threshold
-        start_idx = None
+        regions = signal_intervals(tm_values, threshold)
+        positions = np.asarray(positions)
 
-        for i in range(len(above)):
-            if above[i] and start_idx is None:
-                start_idx = positions[i]
-            elif not above[i] and start_idx is not None:
-                ax2.hlines(y=threshold, xmin=start_idx, xmax=positions[i - 1],
-                           color='blue', linewidth=6)
-                start_idx = None
-
-        if start_idx is not None:
-            ax2.hlines(y=threshold, xmin=start_idx, xmax=positions[-1],
-                       color='blue', linewidth=6)
+        # one hlines call draws every region as a single collection
+        if len(regions):
+            ax2.hlines(y=np.full(len(regions), threshold), xmin=positions[regions["start"]],
+                       xmax=positions[regions["end"] - 1], color='blue', linewidth=6)
 
         ax2.axhline(y=threshold, color='green', linestyle='--', label=f"Threshold = {threshold} °C")
 
@@ -112,11 +87,17 @@ def analyze_fasta():
         text_box.delete(1.0, tk.END)
         text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
 
-        if len(sequence) < 9:
-            text_box.insert(tk.END, "Error: Sequence too short for 9-position sliding window.")
+        if len(sequence) < WINDOW_SIZE:
+            text_box.insert(tk.END, f"Error: Sequence too short for {WINDOW_SIZE}-position sliding window.")
             return
 
-        positions, tm_values = compute_tm_for_sequence(sequence)
+        def compute():
+            positions, tm_values = compute_tm_for_sequence(sequence)
+            return {"positions": positions, "tm_values": tm_values}
+
+        # reloading the same file returns the cached signal
+        tm = cached_analysis(filepath, "tm_simple", compute, window_size=WINDOW_SIZE)
+        positions, tm_values = tm["positions"], tm["tm_values"]
 
         # Display stats
         min_tm, max_tm = min(tm_values), max(tm_values)
@@ -0,0 +1,87 @@
+"""
+#Search the loaded DNA sequence for PCR primer candidates. A candidate is 18-25 nt long,
+# has a GC content between 40% and 60%, a melting temperature between 55 and 62 °C,
+# a GC clamp at the 3' end, no long homopolymer runs and no self-complementary stretches.
+# The user can change the limits and the candidates are listed with their position, GC% and Tm.
+"""
+import os
+import sys
+import tkinter as tk
+from tkinter import filedialog, scrolledtext
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import read_fasta_sequence
+from bioutils.primers import find_primers, primer_sequence
+
+MAX_SHOWN = 200
+
+
+def read_fasta_file(filepath):
+    """Reads a FASTA file and returns only the DNA sequence (ignoring header)."""
+    return read_fasta_sequence(filepath).upper()
+
+
+def read_range(entry_min, entry_max):
+    """Reads a (min, max) pair from two entries."""
+    return float(entry_min.get()), float(entry_max.get())
+
+
+def search_primers():
+    filepath = filedialog.askopenfilename(
+        title="Select a FASTA file",
+        filetypes=(("FASTA files", "*.fasta *.fa"), ("All files", "*.*"))
+    )
+
+    if filepath:
+        sequence = read_fasta_file(filepath)
+        text_box.delete(1.0, tk.END)
+
+        try:
+            min_len, max_len = (int(v) for v in read_range(min_len_entry, max_len_entry))
+            gc_range = read_range(gc_min_entry, gc_max_entry)
+            tm_range = read_range(tm_min_entry, tm_max_entry)
+        except ValueError:
+            text_box.insert(tk.END, "Error: all limits must be numbers.")
+            return
+
+        primers = find_primers(sequence, min_len, max_len, gc_range, tm_range)
+        text_box.insert(tk.END, f"Sequence length: {len(sequence)}\n")
+        text_box.insert(tk.END, f"Found {len(primers)} primer candidates.\n\n")
+
+        for primer in primers[:MAX_SHOWN]:
+            text_box.insert(tk.END, f"{primer['start'] + 1:>8}  {primer_sequence(sequence, primer):<25}  "
+                                    f"GC = {primer['gc']:.1f}%  Tm = {primer['tm']:.1f} °C\n")
+        if len(primers) > MAX_SHOWN:
+            text_box.insert(tk.END, f"\n... {len(primers) - MAX_SHOWN} more not shown.\n")
+
+
+# === GUI Setup ===
+root = tk.Tk()
+root.title("Primer Finder")
+
+frame = tk.Frame(root)
+frame.pack(pady=10)
+
+btn = tk.Button(frame, text="Load FASTA File", command=search_primers)
+btn.grid(row=0, column=0, rowspan=3, padx=5)
+
+
+def add_range(row, label, low, high):
+    tk.Label(frame, text=label).grid(row=row, column=1, sticky="e")
+    entry_min = tk.Entry(frame, width=6)
+    entry_min.grid(row=row, column=2, padx=5)
+    entry_min.insert(0, low)
+    entry_max = tk.Entry(frame, width=6)
+    entry_max.grid(row=row, column=3, padx=5)
+    entry_max.insert(0, high)
+    return entry_min, entry_max
+
+
+min_len_entry, max_len_entry = add_range(0, "Length (nt):", "18", "25")
+gc_min_entry, gc_max_entry = add_range(1, "GC (%):", "40", "60")
+tm_min_entry, tm_max_entry = add_range(2, "Tm (°C):", "55", "62")
+
+text_box = scrolledtext.ScrolledText(root, wrap=tk.NONE, width=80, height=25)
+text_box.pack(padx=10, pady=10)
+
+root.mainloop()
@@ -2,127 +2,54 @@
 Implement an application that converts the coding region of a gene into an amino acid sequence. 
 Use the genetic code from from moodle.
 """
+import os
+import sys
 
-GENETIC_CODE_not_very_usefull = { 
-    "Phe": ["UUU", "UUC"],
-    "Ser": ["UCU", "UCC", "UCA", "UCG", "AGU", "AGC"],
-    "Leu": ["UUA", "UUG", "CUU", "CUC", "CUA", "CUG"],
-    "Tyr": ["UAU", "UAC"],
-    "Cys": ["UGU", "UGC"],
-    "Trp": ["UGG"],
-    "Pro": ["CCU", "CCC", "CCA", "CCG"],
-    "His": ["CAU", "CAC"],
-    "Gln": ["CAA", "CAG"],
-    "Arg": ["CGU", "CGC", "CGA", "CGG", "AGA", "AGG"],
-    "Ile": ["AUU", "AUC", "AUA"],
-    "Met": ["AUG"],
-    "Thr": ["ACU", "ACC", "ACA", "ACG"],
-    "Asn": ["AAU", "AAC"],
-    "Lys": ["AAA", "AAG"],
-    "Val": ["GUU", "GUC", "GUA", "GUG"],
-    "Ala": ["GCU", "GCC", "GCA", "GCG"],
-    "Asp": ["GAU", "GAC"],
-    "Glu": ["GAA", "GAG"],
-    "Gly": ["GGU", "GGC", "GGA", "GGG"],
-    "STOP": ["UAA", "UAG", "UGA"]
-}
-
-genetic_code = {
-    "UUU": "Phe", 
-    "UUC": "Phe",
-    "UUA": "Leu", 
-    "UUG": "Leu",
-    "CUU": "Leu", 
-    "CUC": "Leu", 
-    "CUA": "Leu", 
-    "CUG": "Leu",
-    "AUU": "Ile", 
-    "AUC": "Ile", 
-    "AUA": "Ile",
-    "AUG": "Met",
-    "GUU": "Val", 
-    "GUC": "Val", 
-    "GUA": "Val", 
-    "GUG": "Val",
-    "UCU": "Ser", 
-    "UCC": "Ser", 
-    "UCA": "Ser", 
-    "UCG": "Ser", 
-    "AGU": "Ser", 
-    "AGC": "Ser",
-    "CCU": "Pro", 
-    "CCC": "Pro", 
-    "CCA": "Pro", 
-    "CCG": "Pro",
-    "ACU": "Thr", 
-    "ACC": "Thr", 
-    "ACA": "Thr", 
-    "ACG": "Thr",
-    "GCU": "Ala", 
-    "GCC": "Ala", 
-    "GCA": "Ala", 
-    "GCG": "Ala",
-    "UAU": "Tyr", 
-    "UAC": "Tyr",
-    "CAU": "His",
-    "CAC": "His",
-    "CAA": "Gln", 
-    "CAG": "Gln",
-    "AAU": "Asn", 
-    "AAC": "Asn",
-    "AAA": "Lys", 
-    "AAG": "Lys",
-    "GAU": "Asp", 
-    "GAC": "Asp",
-    "GAA": "Glu", 
-    "GAG": "Glu",
-    "UGU": "Cys", 
-    "UGC": "Cys",
-    "UGG": "Trp",
-    "CGU": "Arg", 
-    "CGC": "Arg", 
-    "CGA": "Arg", 
-    "CGG": "Arg", 
-    "AGA": "Arg", 
-    "AGG": "Arg",
-    "GGU": "Gly", 
-    "GGC": "Gly", 
-    "GGA": "Gly", 
-    "GGG": "Gly",
-    "UAA": "Stop", "UAG": "Stop", "UGA": "Stop"
-}
-
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import read_fasta_sequence
+from bioutils.translation import THREE_LETTER, find_orfs, orf_protein, six_frame_translation, translate
 
 
 S = "AGAAUGGAAUUUUGA"
+MIN_ORF_LENGTH = 100  # amino acids, for whole genomes
+TABLE_ID = 1  # NCBI genetic code: 1 standard, 2 vertebrate mitochondrial, 4 mycoplasma, 11 bacterial
 
 def start_frame(S):
-    for i in range(len(S) - 2):
-        codon = S[i:i+3]
-        if codon == "AUG": 
-            return S[i:]
-    return ""
+    i = S.find("AUG")
+    return S[i:] if i >= 0 else ""
 
 
 def translate_rna_to_protein(mrna_seq):
-    protein = []
-    
-    for i in range(0, len(mrna_seq), 3):
-        codon = mrna_seq[i:i+3]
-        if len(codon) < 3:
-            break
-        amino_acid = genetic_code.get(codon)
-        if amino_acid == "Stop":
-            break
-        protein.append(amino_acid)
-    
-    return "-".join(protein)
+    # one table lookup for the whole frame instead of one dict lookup per codon
+    protein = translate(mrna_seq, table_id=TABLE_ID, to_stop=True)
+    return "-".join(THREE_LETTER[aa] for aa in protein)
+
+
+def report_orfs(sequence, min_length):
+    """Prints the six frames (short sequences only) and every ORF of both strands."""
+    if len(sequence) <= 300:
+        for frame, protein in six_frame_translation(sequence, TABLE_ID).items():
+            print(f"Frame {frame:+d}: {protein}")
+
+    orfs = find_orfs(sequence, min_length, table_id=TABLE_ID)
+    print(f"{len(orfs)} ORFs of at least {min_length} amino acids:")
+    for orf in orfs[:50]:
+        print(f"  {orf['start'] + 1}-{orf['stop']} frame {orf['frame']:+d}, {orf['length']} aa: "
+              f"{orf_protein(sequence, orf, TABLE_ID)[:30]}")
+    if len(orfs) > 50:
+        print(f"  ... {len(orfs) - 50} more")
 
 
 def main():
+    # python lab4_01.py genome.fasta  calls ORFs on a whole genome instead of the example
+    if len(sys.argv) > 1:
+        report_orfs(read_fasta_sequence(sys.argv[1]).upper(), MIN_ORF_LENGTH)
+        return
+
     amino_acids = translate_rna_to_protein(start_frame(S))
     print("mRNA sequence:", S)
     print("Amino acid sequence:", amino_acids)
+    report_orfs(S, 1)
 
 
 if __name__ == "__main__":
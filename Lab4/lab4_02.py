@@ -8,90 +8,55 @@ c) Compare the two results and show the most frequent codons between the two
 d) Show in the output of the console top 3 amino acids for each genome.
 e) What foods have less of the aminoacids found at previous points
 """
-from collections import Counter
+import os
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 
-genetic_code = {
-    "UUU": "Phe", "UUC": "Phe", "UUA": "Leu", "UUG": "Leu",
-    "CUU": "Leu", "CUC": "Leu", "CUA": "Leu", "CUG": "Leu",
-    "AUU": "Ile", "AUC": "Ile", "AUA": "Ile", "AUG": "Met",
-    "GUU": "Val", "GUC": "Val", "GUA": "Val", "GUG": "Val",
-    "UCU": "Ser", "UCC": "Ser", "UCA": "Ser", "UCG": "Ser",
-    "AGU": "Ser", "AGC": "Ser",
-    "CCU": "Pro", "CCC": "Pro", "CCA": "Pro", "CCG": "Pro",
-    "ACU": "Thr", "ACC": "Thr", "ACA": "Thr", "ACG": "Thr",
-    "GCU": "Ala", "GCC": "Ala", "GCA": "Ala", "GCG": "Ala",
-    "UAU": "Tyr", "UAC": "Tyr", "CAU": "His", "CAC": "His",
-    "CAA": "Gln", "CAG": "Gln", "AAU": "Asn", "AAC": "Asn",
-    "AAA": "Lys", "AAG": "Lys", "GAU": "Asp", "GAC": "Asp",
-    "GAA": "Glu", "GAG": "Glu", "UGU": "Cys", "UGC": "Cys",
-    "UGG": "Trp", "CGU": "Arg", "CGC": "Arg", "CGA": "Arg",
-    "CGG": "Arg", "AGA": "Arg", "AGG": "Arg", "GGU": "Gly",
-    "GGC": "Gly", "GGA": "Gly", "GGG": "Gly",
-    "UAA": "Stop", "UAG": "Stop", "UGA": "Stop"
-}
-
-def read_fasta(filename):
-    """Read FASTA file and return the sequence as a single string (DNA → RNA)."""
-    with open(filename, "r") as f:
-        lines = f.readlines()
-    seq = "".join(line.strip() for line in lines if not line.startswith(">"))
-    # Convert DNA to RNA
-    return seq.replace("T", "U")
-
-def codon_frequencies(sequence):
-    """Count codon frequencies in an RNA sequence."""
-    codons = [sequence[i:i+3] for i in range(0, len(sequence)-2, 3) if len(sequence[i:i+3]) == 3]
-    return Counter(codons)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.batch import find_fasta_files
+from bioutils.codon_usage import (CODONS, amino_acid_usage, cai, codon_frequencies, codon_usage_matrix, enc,
+                                  relative_adaptiveness, rscu, save_codon_matrix, top_codons)
+from bioutils.fasta import fasta_label
+from bioutils.translation import THREE_LETTER
 
-def compare_codon_usage(file1, file2):
-    """Compare codon frequencies between two FASTA files, plot top codons, and show amino acids."""
-    seq1 = read_fasta(file1)
-    seq2 = read_fasta(file2)
-
-    freq1 = codon_frequencies(seq1)
-    freq2 = codon_frequencies(seq2)
-
-    total1 = sum(freq1.values())
-    total2 = sum(freq2.values())
-
-    print(f"\n{'Codon':<6} | {'COVID-19 (%)':>12} | {'Influenza (%)':>12}")
-    print("-" * 38)
-
-    all_codons = sorted(set(freq1.keys()) | set(freq2.keys()))
-    for codon in all_codons:
-        f1 = (freq1[codon] / total1 * 100) if codon in freq1 else 0
-        f2 = (freq2[codon] / total2 * 100) if codon in freq2 else 0
-        print(f"{codon:<6} | {f1:>10.3f}% | {f2:>10.3f}%")
-
-    # --- Top 10 codons for each virus ---
-    top10_covid = [codon for codon, _ in freq1.most_common(10)]
-    top10_flu = [codon for codon, _ in freq2.most_common(10)]
+TABLE_ID = 1  # NCBI genetic code used for the amino-acid tallies and RSCU
 
-    # Union of top codons
-    top_codons_union = sorted(set(top10_covid + top10_flu))
+def rna_label(codon):
+    return codon.replace("T", "U")
 
-    # Percentages for the union
-    covid_perc = [(freq1[codon] / total1 * 100) if codon in freq1 else 0 for codon in top_codons_union]
-    flu_perc = [(freq2[codon] / total2 * 100) if codon in freq2 else 0 for codon in top_codons_union]
+def compare_codon_usage(file1, file2):
+    """Compare codon frequencies between two FASTA files, plot top codons, and show amino acids."""
+    files, matrix, errors = codon_usage_matrix([file1, file2])
+    for filepath, error in errors:
+        print(f"Error reading {filepath}: {error}")
+    if len(files) < 2:
+        return
+    perc = codon_frequencies(matrix)
+
+    rows = [f"{'Codon':<6} | {'COVID-19 (%)':>12} | {'Influenza (%)':>12}", "-" * 38]
+    for i in np.flatnonzero(matrix.sum(axis=0)):
+        rows.append(f"{rna_label(CODONS[i]):<6} | {perc[0, i]:>10.3f}% | {perc[1, i]:>10.3f}%")
+    print("\n" + "\n".join(rows))
+
+    # --- Top 10 codons for each virus, and their union ---
+    top = top_codons(matrix, 10)
+    union = np.unique(top)
+    top_codons_union = [rna_label(CODONS[i]) for i in union]
+    covid_perc, flu_perc = perc[0, union], perc[1, union]
 
     # --- Highlight most frequent codons between the two ---
-    combined_freq = [(c, covid_perc[i] + flu_perc[i]) for i, c in enumerate(top_codons_union)]
-    combined_freq.sort(key=lambda x: x[1], reverse=True)
-    most_frequent_codons = [c for c, _ in combined_freq[:5]]
+    combined = union[np.argsort(-(covid_perc + flu_perc), kind="stable")[:5]]
+    most_frequent_codons = [rna_label(CODONS[i]) for i in combined]
     print("\nMost frequent codons between COVID-19 and Influenza:", most_frequent_codons)
 
     # --- Top 3 amino acids for each genome ---
-    def top_amino_acids(freq_counter, genome_name):
-        aa_counter = Counter()
-        for codon, count in freq_counter.items():
-            aa = genetic_code.get(codon, "Unknown")
-            aa_counter[aa] += count
-        print(f"Top 3 amino acids in {genome_name}: {aa_counter.most_common(3)}")
-
-    top_amino_acids(freq1, "COVID-19")
-    top_amino_acids(freq2, "Influenza")
+    amino_acids, aa_counts = amino_acid_usage(matrix, TABLE_ID)
+    for genome_name, counts in zip(("COVID-19", "Influenza"), aa_counts):
+        best = np.argsort(-counts, kind="stable")[:3]
+        print(f"Top 3 amino acids in {genome_name}: {[(THREE_LETTER[amino_acids[i]], int(counts[i])) for i in best]}")
+    effective = enc(matrix, TABLE_ID)
+    print(f"Effective number of codons: COVID-19 {effective[0]:.1f}, Influenza {effective[1]:.1f}")
 
     # --- Plotting grouped bar chart ---
     x = np.arange(len(top_codons_union))
@@ -109,7 +74,32 @@ def compare_codon_usage(file1, file2):
     plt.show()
 
 
+def batch_codon_usage(folders, output="codon_matrix.tsv", top=10):
+    """Codon usage of every genome in the folders, computed in parallel and saved as one matrix."""
+    files = [filepath for folder in folders for filepath in find_fasta_files(folder)]
+    files, matrix, errors = codon_usage_matrix(files)
+    for filepath, error in errors:
+        print(f"Error reading {os.path.basename(filepath)}: {error}")
+    names = [f"{os.path.basename(os.path.dirname(filepath))}/{fasta_label(filepath)}" for filepath in files]
+    save_codon_matrix(output, names, matrix)
+    print(f"Saved {len(names)} x 64 codon matrix to {output}")
+
+    perc = codon_frequencies(matrix)
+    relative = rscu(matrix, TABLE_ID)
+    # codon bias of every genome; CAI is measured against the pooled usage of the batch
+    adaptation = cai(matrix, relative_adaptiveness(matrix, TABLE_ID))
+    effective = enc(matrix, TABLE_ID)
+    for name, codons, row, rscu_row, cai_value, enc_value in zip(names, top_codons(matrix, top), perc, relative,
+                                                                 adaptation, effective):
+        print(f"{name} (CAI {cai_value:.3f}, ENC {enc_value:.1f}): "
+              + ", ".join(f"{rna_label(CODONS[i])} {row[i]:.2f}% (RSCU {rscu_row[i]:.2f})" for i in codons))
+
+
 if __name__ == "__main__":
+    # python lab4_02.py ../Lab10/covid ../Lab10/influenza  compares every genome of the folders
+    if len(sys.argv) > 1:
+        batch_codon_usage(sys.argv[1:])
+        sys.exit(0)
     compare_codon_usage("covid.fasta", "influenza.fasta")
     foods = "If you want foods low in the most frequent amino acids (like Leu, Val, Ile, Ser, Gly), focus on: \nFruits – apples, oranges, berries, melons\nVegetables – lettuce, cucumbers, tomatoes, carrots\nRefined grains – white rice, white bread\nStarches – potatoes, tapioca, corn\nFats and oils – olive oil, butter, coconut oil\nThese foods are carb- or fat-dominant, not protein-dominant, so they have low amino acid content overall"
     print(foods)
\ No newline at end of file
@@ -1,15 +1,19 @@
-import random
 import time
 import matplotlib.pyplot as plt
 import os  # <-- added to extract filenames easily
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from bioutils.debruijn import assembly_stats, debruijn_assemble
+from bioutils.fasta import read_fasta_sequence
+from bioutils.overlap import greedy_assemble
+from bioutils.overlap_graph import overlap_assemble
+from bioutils.simulate import sample_reads
 
 # === Function to read a FASTA file ===
 def read_fasta(filepath):
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    # Remove header (lines starting with ">")
-    seq = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return seq
+    # Headers (lines starting with ">") are dropped by the reader
+    return read_fasta_sequence(filepath)
 
 
 # === Function to compute GC content ===
@@ -21,51 +25,34 @@ def gc_content(sequence):
 
 # === Function to create random samples ===
 def sample_fragments(dna, num_samples=2000, min_len=100, max_len=150):
-    seq_length = len(dna)
-    seqs = []
-    for _ in range(num_samples):
-        length = random.randint(min_len, max_len)
-        start = random.randint(0, seq_length - length)
-        sequence = dna[start:start + length]
-        seqs.append(sequence)
-    return seqs
-
-
-# === Function to find best overlap (>= 10 bases) ===
-def find_best_overlap(current_seq, fragments, used_indices):
-    best_overlap = 0
-    best_fragment = None
-    best_index = None
-
-    for i, frag in enumerate(fragments):
-        if i in used_indices:
-            continue
-        # Check decreasing overlap lengths
-        for j in range(100, 10, -1):
-            if current_seq.endswith(frag[:j]):
-                if j > best_overlap:
-                    best_overlap = j
-                    best_fragment = frag
-                    best_index = i
-    return best_fragment, best_index, best_overlap
+    # all start positions and lengths are drawn at once by the read simulator
+    return sample_reads(dna, num_samples, min_len, max_len)
 
 
 # === Function to assemble fragments ===
 def assemble_fragments(seqs):
-    reconstructed = seqs[0]
-    used = {0}
+    # greedy extension from seqs[0]; candidate fragments come from a prefix index
+    return greedy_assemble(seqs)
+
+
+# === Function to assemble fragments with a De Bruijn graph ===
+def assemble_debruijn(seqs, k=31):
+    # every unitig of the k-mer graph becomes a contig, so repeats and gaps only split contigs
+    return debruijn_assemble(seqs, k)
+
 
-    while True:
-        next_frag, next_idx, overlap = find_best_overlap(reconstructed, seqs, used)
-        if next_frag is None or overlap < 10:
-            break
-        reconstructed += next_frag[overlap:]
-        used.add(next_idx)
-    return reconstructed
+# === Function to assemble fragments from an overlap graph ===
+def assemble_overlap_graph(seqs):
+    # all overlaps are found in worker processes, then chained longest-overlap first
+    return overlap_assemble(seqs)
 
 
 # === MAIN SECTION ===
 
+# python ex2.py debruijn  uses the De Bruijn graph instead of the greedy extender,
+# python ex2.py olc  the parallel overlap graph and greedy layout
+ASSEMBLER = sys.argv[1] if len(sys.argv) > 1 else "greedy"
+
 fasta_files = [
     'viruses\\bovine_stomatitis.fasta', 'viruses\\camelpox.fasta', "viruses\\canarypox.fasta",
     "viruses\\ectomelia.fasta", "viruses\\fowlpox.fasta", "viruses\\goatpox.fasta",
@@ -73,40 +60,54 @@ fasta_files = [
     "viruses\\yaba_monkey_tumor.fasta"
 ]
 
-assembly_times = []
-gc_percentages = []
-virus_names = []
-
-for fasta_path in fasta_files:
-    dna = read_fasta(fasta_path)
-    gc = gc_content(dna)
-    gc_percentages.append(gc)
-
-    seqs = sample_fragments(dna)
-
-    start_time = time.time()
-    assembled = assemble_fragments(seqs)
-    end_time = time.time()
-
-    elapsed_ms = (end_time - start_time) * 1000
-    assembly_times.append(elapsed_ms)
-
-    virus_name = os.path.basename(fasta_path).replace(".fasta", "")
-    virus_names.append(virus_name)
-
-    print(f"{virus_name}: GC% = {gc:.2f}, Time = {elapsed_ms:.2f} ms")
-
-# === Plot chart ===
-plt.figure(figsize=(10, 7))
-plt.scatter(gc_percentages, assembly_times, color="blue", s=80)
-
-# Add labels next to each point
-for i, name in enumerate(virus_names):
-    plt.text(gc_percentages[i] + 0.1, assembly_times[i] + 5, name, fontsize=9)
-
-plt.xlabel("Overall C + G Percentage (%)")
-plt.ylabel("Assembly Time (ms)")
-plt.title("DNA Assembly Time vs GC Content (10 Viral Genomes)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+def main():
+    # the overlap-graph mode starts worker processes, which re-import this file on
+    # Windows, so the work only runs when the script is started directly
+    assembly_times = []
+    gc_percentages = []
+    virus_names = []
+
+    for fasta_path in fasta_files:
+        dna = read_fasta(fasta_path)
+        gc = gc_content(dna)
+        gc_percentages.append(gc)
+
+        seqs = sample_fragments(dna)
+
+        start_time = time.time()
+        if ASSEMBLER == "debruijn":
+            contigs = assemble_debruijn(seqs)
+        elif ASSEMBLER == "olc":
+            contigs = assemble_overlap_graph(seqs)
+        else:
+            contigs = [assemble_fragments(seqs)]
+        end_time = time.time()
+
+        elapsed_ms = (end_time - start_time) * 1000
+        assembly_times.append(elapsed_ms)
+
+        virus_name = os.path.basename(fasta_path).replace(".fasta", "")
+        virus_names.append(virus_name)
+
+        stats = assembly_stats(contigs)
+        print(f"{virus_name}: GC% = {gc:.2f}, Time = {elapsed_ms:.2f} ms, "
+              f"{stats['contigs']} contigs, longest = {stats['longest']}, N50 = {stats['n50']}")
+
+    # === Plot chart ===
+    plt.figure(figsize=(10, 7))
+    plt.scatter(gc_percentages, assembly_times, color="blue", s=80)
+
+    # Add labels next to each point
+    for i, name in enumerate(virus_names):
+        plt.text(gc_percentages[i] + 0.1, assembly_times[i] + 5, name, fontsize=9)
+
+    plt.xlabel("Overall C + G Percentage (%)")
+    plt.ylabel("Assembly Time (ms)")
+    plt.title(f"DNA Assembly Time vs GC Content (10 Viral Genomes, {ASSEMBLER} assembler)")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
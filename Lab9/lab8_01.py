@@ -46,28 +46,45 @@ Output of the implementation:
 2. Cleavage positions and length of fragments.
 3. A simulation of the electrophoresis gel based on the number of restriction enzymes used.
 """
+import os
 import random
 import re
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.fasta import fetch_region, load_fasta_index, read_fasta_sequence
 
-def load_fasta(filename, min_len=1000, max_len=3000):
-
-    with open(filename, "r") as f:
-        data = f.read().splitlines()
 
-    seq = "".join([line.strip() for line in data if not line.startswith(">")]).upper()
+def load_fasta(filename, min_len=1000, max_len=3000):
 
-    if len(seq) < min_len:
+    # the .fai index gives the length and lets us read only the chosen window;
+    # ragged, multi-record or unindexable (e.g. read-only folder) files fall back
+    # to reading all records joined together
+    try:
+        index = load_fasta_index(filename)
+    except (ValueError, OSError):
+        index = None
+    if index is not None and len(index) == 1:
+        entry = next(iter(index.values()))
+        seq_len = entry["length"]
+        seq = None
+    else:
+        seq = read_fasta_sequence(filename).upper()
+        seq_len = len(seq)
+
+    if seq_len < min_len:
         raise ValueError("Sequence too short!")
     
-    target_len = random.randint(min_len, min(max_len, len(seq)))
-    start = random.randint(0, len(seq) - target_len)
+    target_len = random.randint(min_len, min(max_len, seq_len))
+    start = random.randint(0, seq_len - target_len)
     end = start + target_len
 
-    print(f"Loaded DNA length: {len(seq)}")
+    print(f"Loaded DNA length: {seq_len}")
     print(f"Using subsequence [{start}:{end}] (length {target_len})\n")
 
-    return seq[start:end]
+    if seq is not None:
+        return seq[start:end]
+    return fetch_region(filename, entry["name"], start, end, index).upper()
 
 def find_cuts(sequence, enzyme):
     site = enzyme["site"]
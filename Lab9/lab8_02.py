@@ -11,17 +11,18 @@ in one general elctrophoresys gel.
 
 
 import os
-import glob
+import sys
 import re
 from collections import OrderedDict
 import math
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bioutils.batch import find_fasta_files, run_batch
+from bioutils.fasta import fasta_label, read_fasta_sequence
 
-FASTA_FOLDER = "influenza"   
-FASTA_GLOB = os.path.join(FASTA_FOLDER, "*.fasta")
 
-FASTA_GLOB_ALT = os.path.join(FASTA_FOLDER, "*.fa")
+FASTA_FOLDER = "influenza"   
 
 ENZYMES = [
     {"name": "EcoRI",  "site": "GAATTC", "cut": 1},
@@ -40,17 +41,8 @@ OUTPUT_IMAGE = "merged_diff_gel.png"
 
 def read_fasta_first_sequence(path):
 
-    seq_lines = []
-    with open(path, "r") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                
-                continue
-            seq_lines.append(line)
-    sequence = "".join(seq_lines).upper()
+    # plain, .gz and BGZF files are all read by the shared reader
+    sequence = read_fasta_sequence(path).upper()
     if not sequence:
         raise ValueError(f"No sequence found in {path}")
     return sequence
@@ -88,6 +80,11 @@ def digest_sequence(sequence, enzymes):
     return fragments
 
 
+def digest_file(path, enzymes):
+    # runs in a worker process
+    return digest_sequence(read_fasta_first_sequence(path), enzymes)
+
+
 def round_band_size(size, bin_size=BIN_SIZE):
     return int(round(size / bin_size) * bin_size)
 
@@ -98,9 +95,9 @@ def bands_to_rounded_set(bands, bin_size=BIN_SIZE):
 
 def main():
    
-    files = sorted(glob.glob(FASTA_GLOB) + glob.glob(FASTA_GLOB_ALT))
+    files = find_fasta_files(FASTA_FOLDER)
     if not files:
-        print(f"No FASTA files found in {FASTA_FOLDER}. Looked for {FASTA_GLOB} and {FASTA_GLOB_ALT}.")
+        print(f"No FASTA files found in {FASTA_FOLDER}.")
         return
 
     print(f"Found {len(files)} FASTA files. Processing...")
@@ -109,14 +106,22 @@ def main():
     sample_fragments = OrderedDict()   # sample -> list of fragments (raw sizes)
     sample_rounded_sets = OrderedDict()  # sample -> set of rounded band sizes
 
+    digested = {}
+    for path, fragments, seconds, error in run_batch(files, digest_file, ENZYMES):
+        if error is not None:
+            print(f"Skipping {path}: {error}")
+            continue
+        digested[path] = fragments
+        print(f"Simulated gel bands for {fasta_label(path)} ({seconds:.2f} s): {fragments}")
+
+    # keep the lanes in file order, whatever order the workers finished in
     for path in files:
-        name = os.path.splitext(os.path.basename(path))[0]
+        if path not in digested:
+            continue
+        name = fasta_label(path)
         sample_names.append(name)
-        seq = read_fasta_first_sequence(path)
-        fragments = digest_sequence(seq, ENZYMES)
-        sample_fragments[name] = fragments
-        sample_rounded_sets[name] = bands_to_rounded_set(fragments, BIN_SIZE)
-        print(f"Simulated gel bands for {name}: {fragments}")
+        sample_fragments[name] = digested[path]
+        sample_rounded_sets[name] = bands_to_rounded_set(digested[path], BIN_SIZE)
 
     all_sets = list(sample_rounded_sets.values())
     if not all_sets:
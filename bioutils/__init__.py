@@ -0,0 +1,6 @@
+"""
+Shared helpers used by the lab scripts (FASTA input, sequence engines, ...).
+
+The labs are run from their own folder, so each script adds the repository
+root to sys.path before importing from here.
+"""
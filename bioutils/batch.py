@@ -0,0 +1,50 @@
+"""
+Parallel batch driver for the folder scanners.
+
+Every file is handed to a worker process and the results are streamed back in
+the order they finish, together with the time the worker spent on the file.
+The analysis function must be defined at module level (so it can be sent to
+the worker processes) and is called as analyze(filepath, *args).
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bioutils.fasta import fasta_patterns
+
+
+def find_fasta_files(folder):
+    """Sorted list of plain and compressed FASTA files in a folder."""
+    files = set()
+    for pattern in fasta_patterns():
+        files.update(glob.glob(os.path.join(folder, pattern)))
+    return sorted(files)
+
+
+def _timed_call(analyze, filepath, args):
+    start = time.perf_counter()
+    try:
+        result, error = analyze(filepath, *args), None
+    except Exception as e:
+        result, error = None, e
+    return result, time.perf_counter() - start, error
+
+
+def run_batch(files, analyze, *args, workers=None):
+    """Yields (filepath, result, seconds, error) for every file as it finishes.
+
+    error is None on success; otherwise result is None and error holds the
+    exception raised by analyze for that file. workers=1 runs everything in
+    the current process, which is handy for debugging.
+    """
+    if workers == 1:
+        for filepath in files:
+            yield (filepath,) + _timed_call(analyze, filepath, args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_timed_call, analyze, filepath, args): filepath for filepath in files}
+        for future in as_completed(futures):
+            yield (futures[future],) + future.result()
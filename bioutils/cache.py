@@ -0,0 +1,151 @@
+"""
+Content-addressed on-disk cache for parsed genomes and derived signals.
+
+An entry is keyed by the SHA-256 of the input file's content plus the analysis
+parameters (window size, PWM, enzyme set, scoring method, ...), so renaming or
+touching a file keeps its entry, while editing it or changing a parameter
+misses. Each analysis also passes a version number, bumped whenever the code
+that computes it changes, so results of an older implementation are not reused.
+Entries are dicts of NumPy arrays stored as compressed .npz files.
+When the cache grows past its size limit the least recently used entries are
+removed.
+
+The cache folder is $BIOUTILS_CACHE, or ~/.cache/bioutils when it is not set.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HASH_BLOCK_SIZE = 1 << 20
+
+# digests already computed in this process, keyed by (path, mtime, size)
+_digest_memo = {}
+
+
+def default_cache_dir():
+    return os.environ.get("BIOUTILS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "bioutils"))
+
+
+def file_digest(filepath):
+    """SHA-256 hex digest of a file's content, read in 1 MiB blocks."""
+    stat = os.stat(filepath)
+    memo_key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    if memo_key in _digest_memo:
+        return _digest_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def cache_key(filepath, analysis, version=1, **params):
+    """Key for one analysis of one file; params must be JSON-serialisable."""
+    payload = json.dumps({"file": file_digest(filepath), "analysis": analysis, "version": version,
+                          "params": params}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-limited folder of .npz entries with least-recently-used eviction."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key):
+        """Returns the stored dict of arrays, or None on a miss.
+
+        An unreadable (truncated or corrupt) entry is deleted and counts as a miss.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return arrays
+
+    def put(self, key, arrays):
+        """Stores a dict of arrays and evicts old entries if over the limit.
+
+        The new entry itself is never evicted, even when it alone is larger than
+        max_bytes, so it is not recomputed on every run.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self._path(key))  # atomic, safe with parallel workers
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.evict(keep=self._path(key))
+
+    def evict(self, keep=None):
+        """Removes least recently used entries until the cache fits max_bytes.
+
+        The entry at path keep counts towards the size but is left in place.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.directory, name))
+
+
+def cached_analysis(filepath, analysis, compute, cache=None, version=1, **params):
+    """Returns compute() for this file and parameters, from the cache when possible.
+
+    compute must return a dict of arrays (or values NumPy can turn into arrays).
+    Bump version when compute changes so that older entries are not reused.
+    """
+    if cache is None:
+        cache = ResultCache()
+    key = cache_key(filepath, analysis, version, **params)
+    arrays = cache.get(key)
+    if arrays is None:
+        arrays = {name: np.asarray(value) for name, value in compute().items()}
+        cache.put(key, arrays)
+    return arrays
@@ -0,0 +1,242 @@
+"""
+Codon usage of many genomes at once.
+
+Every genome becomes one row of 64 codon counts (reading frame 0 of the whole
+file, as in Lab4), computed in worker processes with bioutils.batch. The
+genomes x 64 matrix is the only thing that has to be kept: codon frequencies,
+RSCU, amino-acid usage, the top codons and the bias indices (CAI against a
+reference usage, ENC) all come from it with array operations, and it can be
+saved as a tab-separated table.
+
+Usage:
+    python -m bioutils.codon_usage <folder> [<folder> ...] [-o matrix.tsv] [--top N] [--table ID]
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from bioutils.batch import find_fasta_files, run_batch
+from bioutils.fasta import fasta_label, read_fasta_sequence
+from bioutils.kmers import kmer_labels
+from bioutils.translation import THREE_LETTER, UNKNOWN_CODON, codon_indices, get_table
+
+CODONS = kmer_labels(3)
+
+
+def codon_counts(sequence, frame=0):
+    """Counts of the 64 codons of one reading frame (codons with N are skipped)."""
+    codons = codon_indices(sequence, frame)
+    return np.bincount(codons, minlength=UNKNOWN_CODON + 1)[:UNKNOWN_CODON]
+
+
+def count_file_codons(filepath, frame=0):
+    """Worker for codon_usage_matrix: codon counts of one FASTA file."""
+    return codon_counts(read_fasta_sequence(filepath).upper(), frame)
+
+
+def codon_usage_matrix(files, frame=0, workers=None):
+    """(files, matrix, errors): a genomes x 64 count matrix, rows in the order of files.
+
+    Files that fail are left out of the matrix and listed in errors as
+    (filepath, exception) pairs.
+    """
+    rows, errors = {}, []
+    for filepath, counts, seconds, error in run_batch(files, count_file_codons, frame, workers=workers):
+        if error is not None:
+            errors.append((filepath, error))
+        else:
+            rows[filepath] = counts
+    done = [filepath for filepath in files if filepath in rows]
+    matrix = np.array([rows[filepath] for filepath in done], dtype=np.int64).reshape(len(done), UNKNOWN_CODON)
+    return done, matrix, errors
+
+
+def codon_frequencies(matrix):
+    """Row-normalised codon frequencies (%)."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    totals = matrix.sum(axis=-1, keepdims=True)
+    return np.divide(matrix * 100, totals, out=np.zeros_like(matrix), where=totals > 0)
+
+
+@lru_cache(maxsize=None)
+def _amino_acid_groups(table_id):
+    """Amino-acid letters of a table and its 64 x n_amino_acids codon membership matrix."""
+    amino_acids, groups = np.unique(get_table(table_id)[:UNKNOWN_CODON], return_inverse=True)
+    one_hot = np.zeros((UNKNOWN_CODON, len(amino_acids)), dtype=np.int64)
+    one_hot[np.arange(UNKNOWN_CODON), groups] = 1
+    one_hot.flags.writeable = False
+    return amino_acids.tobytes().decode("ascii"), one_hot
+
+
+def amino_acid_usage(matrix, table_id=1):
+    """(amino_acids, counts): codon counts summed per amino acid ('*' = stop)."""
+    amino_acids, one_hot = _amino_acid_groups(table_id)
+    return amino_acids, np.asarray(matrix) @ one_hot
+
+
+def rscu(matrix, table_id=1):
+    """Relative synonymous codon usage: count / mean count of its synonymous codons.
+
+    A codon used exactly as often as its synonyms scores 1. Amino acids that
+    do not occur in a genome get 0 for all their codons.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    _, one_hot = _amino_acid_groups(table_id)
+    # family total and family size of every codon's amino acid
+    family_total = (matrix @ one_hot) @ one_hot.T
+    family_size = one_hot.sum(axis=0) @ one_hot.T
+    expected = family_total / family_size
+    return np.divide(matrix, expected, out=np.zeros_like(matrix), where=expected > 0)
+
+
+def relative_adaptiveness(reference, table_id=1, pseudocount=0.5):
+    """CAI weights w of the 64 codons from a reference codon-count vector.
+
+    w = count / count of the most used synonymous codon. Stop codons and
+    amino acids with a single codon (Met, Trp in the standard code) get NaN
+    and are left out of CAI; unused codons get the pseudocount instead of 0.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    if reference.ndim > 1:
+        reference = reference.sum(axis=0)
+    amino_acids, one_hot = _amino_acid_groups(table_id)
+    reference = np.maximum(reference, pseudocount)
+    # largest count in every codon's family
+    family_max = (one_hot * reference[:, None]).max(axis=0) @ one_hot.T
+    weights = reference / family_max
+    family_size = one_hot.sum(axis=0) @ one_hot.T
+    stop = np.frombuffer(amino_acids.encode("ascii"), dtype=np.uint8)[one_hot.argmax(axis=1)] == ord("*")
+    weights[(family_size < 2) | stop] = np.nan
+    return weights
+
+
+def cai(matrix, weights):
+    """Codon Adaptation Index of every row: geometric mean of w over its codons."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    used = ~np.isnan(weights)
+    log_weights = np.where(used, np.log(np.where(used, weights, 1)), 0)
+    n = matrix @ used
+    return np.exp(np.divide(matrix @ log_weights, n, out=np.zeros_like(n, dtype=np.float64), where=n > 0))
+
+
+def enc(matrix, table_id=1):
+    """Effective number of codons (Wright 1990) of every row, between 20 and 61.
+
+    Homozygosity F is computed for every amino acid seen at least twice,
+    averaged within each degeneracy class (2, 3, 4, 6 codons in the standard
+    code), and ENC = sum over classes of amino acids in class / mean F. A
+    class with no usable amino acid counts as unbiased, and mean F is kept
+    at or above 1 / class size.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    amino_acids, one_hot = _amino_acid_groups(table_id)
+    sense = np.array([aa != "*" for aa in amino_acids])
+    one_hot = one_hot[:, sense]
+    family_size = one_hot.sum(axis=0)
+
+    n = matrix @ one_hot
+    squares = (matrix ** 2) @ one_hot
+    usable = n > 1
+    safe_n = np.where(usable, n, 2)
+    homozygosity = np.where(usable, (squares / safe_n - 1) / (safe_n - 1), 0)
+
+    result = np.zeros(matrix.shape[:-1])
+    for size in np.unique(family_size):
+        in_class = family_size == size
+        if size == 1:
+            result += in_class.sum()
+            continue
+        found = usable[..., in_class].sum(axis=-1)
+        mean_f = np.divide(homozygosity[..., in_class].sum(axis=-1), found,
+                           out=np.full(found.shape, 1 / size), where=found > 0)
+        result += in_class.sum() / np.maximum(mean_f, 1 / size)
+    return np.minimum(result, family_size.sum())
+
+
+def cai_profile(sequence, weights, window_codons=100, step=1, frame=0):
+    """CAI of every window of window_codons codons along one reading frame.
+
+    Returns a dict with 'positions' (1-based nucleotide start of each window)
+    and 'cai'; windows are slid by `step` codons. Sums of log-weights come
+    from one cumulative sum, so the cost does not depend on the window size.
+    """
+    codons = codon_indices(sequence, frame)
+    used = np.append(~np.isnan(weights), False)
+    log_weights = np.append(np.where(used[:-1], np.log(np.where(used[:-1], weights, 1)), 0), 0)
+    log_prefix = np.concatenate([[0.0], np.cumsum(log_weights[codons])])
+    used_prefix = np.concatenate([[0], np.cumsum(used[codons])])
+
+    starts = np.arange(0, max(len(codons) - window_codons + 1, 0), step)
+    total = log_prefix[starts + window_codons] - log_prefix[starts]
+    n = used_prefix[starts + window_codons] - used_prefix[starts]
+    values = np.exp(np.divide(total, n, out=np.full(len(starts), np.nan), where=n > 0))
+    return {"positions": starts * 3 + frame + 1, "cai": values}
+
+
+def top_codons(matrix, n=10):
+    """Indices of the n most used codons of every genome, most used first."""
+    matrix = np.asarray(matrix)
+    return np.argsort(-matrix, axis=-1, kind="stable")[..., :n]
+
+
+def save_codon_matrix(path, names, matrix):
+    """Writes the matrix as a TSV table: one genome per row, one codon per column."""
+    with open(path, "w") as f:
+        f.write("genome\t" + "\t".join(CODONS) + "\n")
+        for name, row in zip(names, matrix):
+            f.write(name + "\t" + "\t".join(map(str, row)) + "\n")
+
+
+def load_codon_matrix(path):
+    """(names, matrix) of a table written by save_codon_matrix."""
+    names, rows = [], []
+    with open(path) as f:
+        next(f)
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            names.append(fields[0])
+            rows.append([int(value) for value in fields[1:]])
+    return names, np.array(rows, dtype=np.int64).reshape(len(names), UNKNOWN_CODON)
+
+
+def _option(args, name, default):
+    """Removes `name value` from args and returns value (or default)."""
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output = _option(args, "-o", None)
+    top = int(_option(args, "--top", 10))
+    table_id = int(_option(args, "--table", 1))
+    if not args:
+        print("Usage: python -m bioutils.codon_usage <folder> [<folder> ...] [-o matrix.tsv] [--top N] [--table ID]")
+        sys.exit(1)
+
+    files = [filepath for folder in args for filepath in find_fasta_files(folder)]
+    files, matrix, errors = codon_usage_matrix(files)
+    for filepath, error in errors:
+        print(f"Error reading {os.path.basename(filepath)}: {error}")
+    names = [f"{os.path.basename(os.path.dirname(filepath))}/{fasta_label(filepath)}" for filepath in files]
+
+    amino_acids, aa_counts = amino_acid_usage(matrix, table_id)
+    frequencies = codon_frequencies(matrix)
+    for name, row, codon_top, aa_row in zip(names, frequencies, top_codons(matrix, top), aa_counts):
+        if not aa_row.any():
+            print(f"{name}: no codons")
+            continue
+        codons = ", ".join(f"{CODONS[i]} {row[i]:.2f}%" for i in codon_top)
+        aas = ", ".join(THREE_LETTER[amino_acids[i]] for i in np.argsort(-aa_row, kind="stable")[:3])
+        print(f"{name}: {codons} | top amino acids: {aas}")
+
+    if output:
+        save_codon_matrix(output, names, matrix)
+        print(f"Saved {len(names)} x {UNKNOWN_CODON} codon matrix to {output}")
@@ -0,0 +1,125 @@
+"""
+Sliding-window composition from prefix sums.
+
+For every symbol the running count (cumulative sum of "position holds this
+symbol") is built once; the count of a symbol in the window [i, i + w) is then
+prefix[i + w] - prefix[i]. All windows of all symbols therefore cost O(n) in
+total instead of O(n * w), whatever the window size and step. Up to four
+symbols share one uint64 prefix sum (16 bits each, see _counts_packed), so the
+usual A/C/G/T chart needs a single pass over the sequence.
+
+Results are 2-D NumPy arrays with one row per symbol and one column per window.
+The sequence may be a string, bytes, or an array of codes 0-4 (for example
+from GenomeStore.codes). Codes are counted directly, without turning them back
+into text, and stand for the letters A, C, G, T and N.
+"""
+
+import sys
+
+import numpy as np
+
+_LANE_BITS = 16
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_LANES = 64 // _LANE_BITS
+_CODE_LETTERS = "ACGTN"  # letter of every code 0-4
+_NO_CODE = 255  # value no code takes, for letters that have no code of their own
+
+
+def _as_values(sequence):
+    """Returns (values, is_codes): the codes of an encoded array, else the bytes."""
+    if isinstance(sequence, np.ndarray):
+        return sequence, True
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+    return np.frombuffer(sequence, dtype=np.uint8), False
+
+
+def _alphabet(values, is_codes):
+    present = np.flatnonzero(np.bincount(values, minlength=256))
+    return sorted(_CODE_LETTERS[v] if is_codes else chr(v) for v in present)
+
+
+def _symbol_values(alphabet, is_codes):
+    """The value every symbol of the alphabet takes in the sequence."""
+    if not is_codes:
+        return [ord(symbol) for symbol in alphabet]
+    codes = [_CODE_LETTERS.find(symbol.upper()) for symbol in alphabet]
+    return [code if code >= 0 else _NO_CODE for code in codes]
+
+
+def sequence_alphabet(sequence):
+    """Sorted list of the distinct symbols of the sequence."""
+    return _alphabet(*_as_values(sequence))
+
+
+def window_starts(length, window_size, step=1):
+    """Start position of every complete window."""
+    if length < window_size:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(0, length - window_size + 1, step, dtype=np.int64)
+
+
+def window_counts(sequence, window_size, step=1, alphabet=None):
+    """Counts of every symbol in every window, shape (len(alphabet), windows).
+
+    alphabet defaults to the sorted symbols of the sequence. Returns the
+    alphabet used together with the counts.
+    """
+    raw, is_codes = _as_values(sequence)
+    if alphabet is None:
+        alphabet = _alphabet(raw, is_codes)
+    values = _symbol_values(alphabet, is_codes)
+    n_windows = len(window_starts(len(raw), window_size, step))
+    counts = np.empty((len(alphabet), n_windows), dtype=np.int32)
+    if n_windows == 0:
+        return alphabet, counts
+
+    last = (n_windows - 1) * step + 1
+    if window_size >= 1 << _LANE_BITS:
+        _counts_per_symbol(raw, window_size, step, values, last, counts)
+    else:
+        for first in range(0, len(alphabet), _LANES):
+            _counts_packed(raw, window_size, step, values[first:first + _LANES], last,
+                           counts[first:first + _LANES])
+    return alphabet, counts
+
+
+def _counts_packed(raw, window_size, step, values, last, out):
+    """Up to four symbols with one prefix sum.
+
+    Every position contributes 1 << (16 * lane of its symbol) to a single
+    uint64 running sum. The lanes overflow into each other in the running sum,
+    but a window difference is exact modulo 2**64 and no lane of it can
+    exceed the window size, so each 16-bit lane of the difference is exactly
+    that symbol's count.
+    """
+    table = np.zeros(256, dtype=np.uint64)
+    for lane, value in enumerate(values):
+        table[value] = np.uint64(1) << np.uint64(_LANE_BITS * lane)
+
+    prefix = np.zeros(len(raw) + 1, dtype=np.uint64)
+    np.cumsum(np.take(table, raw), out=prefix[1:])
+    packed = prefix[window_size:window_size + last:step] - prefix[:last:step]
+    if sys.byteorder == "little":
+        lanes = packed.view(np.uint16).reshape(-1, _LANES)
+        for lane in range(len(values)):
+            out[lane] = lanes[:, lane]
+    else:
+        for lane in range(len(values)):
+            out[lane] = (packed >> np.uint64(_LANE_BITS * lane)) & np.uint64(_LANE_MASK)
+
+
+def _counts_per_symbol(raw, window_size, step, values, last, out):
+    """One prefix sum per symbol, for windows too large for 16-bit lanes."""
+    prefix = np.zeros(len(raw) + 1, dtype=np.int64)
+    for row, value in enumerate(values):
+        np.cumsum(raw == value, out=prefix[1:])
+        out[row] = prefix[window_size:window_size + last:step] - prefix[:last:step]
+
+
+def window_frequencies(sequence, window_size, step=1, alphabet=None, dtype=np.float32):
+    """Relative frequency of every symbol in every window, shape (symbols, windows)."""
+    alphabet, counts = window_counts(sequence, window_size, step, alphabet)
+    frequencies = counts.astype(dtype)
+    frequencies /= window_size
+    return alphabet, frequencies
@@ -0,0 +1,148 @@
+"""
+De Bruijn graph assembler (Lab5).
+
+All reads are encoded into one array, separated by an ambiguous code so no
+k-mer spans two reads, and every k-mer becomes one base-4 number. The sorted
+array of distinct k-mers (with their counts) is the graph: the successors of
+a k-mer x are the k-mers (x << 2 | b) & mask, its predecessors (x >> 2) |
+b << 2(k-1), and both are found for all nodes at once with searchsorted.
+
+Unitigs (maximal paths where every link is the only way out of one k-mer and
+the only way into the next) are compacted with pointer jumping: each node
+learns the head of its path and its distance from it in log2(n) array
+passes. Cycles without a head are cut at their smallest node first. Each
+unitig is reported as a contig, longest first.
+
+The reads are assumed to come from one strand, as in the Lab5 sampler.
+"""
+
+import numpy as np
+
+from bioutils.encoding import decode_codes, encode_sequence
+from bioutils.kmers import decode_kmer, rolling_kmers
+
+DEFAULT_K = 31
+
+
+def _read_kmers(fragments, k):
+    """Numbers of all k-mers of the reads, none spanning two reads."""
+    separator = chr(0)
+    codes = encode_sequence(separator.join(fragments))  # chr(0) encodes as AMBIGUOUS
+    values, _, valid = rolling_kmers(codes, k, with_reverse=False)
+    return values[valid]
+
+
+def _lookup(nodes, values):
+    """Index of every value in the sorted nodes array, -1 where it is missing."""
+    found = np.searchsorted(nodes, values)
+    found = np.minimum(found, len(nodes) - 1)
+    return np.where(nodes[found] == values, found, -1)
+
+
+def _unique_links(nodes, k):
+    """(next, prev): the unambiguous successor / predecessor of every node, or -1."""
+    mask = (1 << (2 * k)) - 1
+    successors = np.stack([_lookup(nodes, ((nodes << 2) | b) & mask) for b in range(4)])
+    predecessors = np.stack([_lookup(nodes, (nodes >> 2) | (b << (2 * (k - 1)))) for b in range(4)])
+    out_degree = (successors >= 0).sum(axis=0)
+    in_degree = (predecessors >= 0).sum(axis=0)
+
+    nxt = np.where(out_degree == 1, successors.max(axis=0), -1)
+    # a link only joins a unitig if the successor has no other way in
+    nxt = np.where((nxt >= 0) & (in_degree[np.maximum(nxt, 0)] == 1), nxt, -1)
+    prev = np.full(len(nodes), -1, dtype=np.int64)
+    linked = np.flatnonzero(nxt >= 0)
+    prev[nxt[linked]] = linked
+    return nxt, prev
+
+
+def _jump(prev, rounds):
+    """Pointer jumping along prev: (head, distance from head, still pointing)."""
+    index = np.arange(len(prev))
+    pointer = prev.copy()
+    head = np.where(prev >= 0, prev, index)
+    rank = (prev >= 0).astype(np.int64)
+    for _ in range(rounds):
+        active = np.flatnonzero(pointer >= 0)
+        if len(active) == 0:
+            break
+        target = pointer[active]
+        rank[active] += rank[target]
+        head[active] = head[target]
+        pointer[active] = pointer[target]
+    return head, rank, pointer
+
+
+def _break_cycles(nxt, prev, rounds):
+    """Cuts every cycle of links at its smallest node (in place)."""
+    _, _, pointer = _jump(prev, rounds)
+    cyclic = pointer >= 0
+    if not cyclic.any():
+        return
+    smallest = np.where(cyclic, np.arange(len(prev)), len(prev))
+    step = np.where(cyclic, prev, np.arange(len(prev)))
+    for _ in range(rounds):
+        smallest = np.minimum(smallest, smallest[step])
+        step = step[step]
+    heads = np.flatnonzero(cyclic & (smallest == np.arange(len(prev))))
+    nxt[prev[heads]] = -1
+    prev[heads] = -1
+
+
+def unitigs(nodes, k):
+    """Sequences of the compacted unitigs of a sorted array of distinct k-mers."""
+    if len(nodes) == 0:
+        return []
+    nxt, prev = _unique_links(nodes, k)
+    rounds = int(np.ceil(np.log2(len(nodes)))) + 1
+    _break_cycles(nxt, prev, rounds)
+    head, rank, _ = _jump(prev, rounds)
+
+    order = np.lexsort((rank, head))
+    ordered_heads = head[order]
+    last_bases = (nodes[order] & 3).astype(np.uint8)
+    bounds = np.flatnonzero(np.diff(ordered_heads)) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(order)]])
+
+    sequences = []
+    for start, end in zip(starts, ends):
+        first = decode_kmer(int(nodes[order[start]]), k)
+        sequences.append(first + decode_codes(last_bases[start + 1:end]))
+    return sequences
+
+
+def debruijn_assemble(fragments, k=DEFAULT_K, min_count=1, min_length=None):
+    """Contigs (longest first) from a De Bruijn graph of the fragments.
+
+    k-mers seen fewer than min_count times are dropped (use 2 or more when
+    the reads have sequencing errors); contigs shorter than min_length
+    (default 2k) are left out.
+    """
+    min_length = 2 * k if min_length is None else min_length
+    values = _read_kmers(fragments, k)
+    nodes, counts = np.unique(values, return_counts=True)
+    nodes = nodes[counts >= min_count]
+    contigs = [contig for contig in unitigs(nodes, k) if len(contig) >= min_length]
+    contigs.sort(key=len, reverse=True)
+    return contigs
+
+
+def n50(lengths):
+    """Length L such that contigs of length >= L hold at least half of the bases."""
+    lengths = np.sort(np.asarray(lengths, dtype=np.int64))[::-1]
+    if len(lengths) == 0:
+        return 0
+    covered = np.cumsum(lengths)
+    return int(lengths[np.searchsorted(covered, covered[-1] / 2)])
+
+
+def assembly_stats(contigs):
+    """Contig count, total length, longest contig and N50."""
+    lengths = [len(contig) for contig in contigs]
+    return {
+        "contigs": len(lengths),
+        "total": sum(lengths),
+        "longest": max(lengths, default=0),
+        "n50": n50(lengths),
+    }
@@ -0,0 +1,58 @@
+"""
+Integer encoding of nucleotide sequences.
+
+A, C, G, T (and U) become the codes 0, 1, 2, 3. Every other symbol (N and the
+IUPAC ambiguity letters) becomes AMBIGUOUS, so the engines can mask those
+positions out instead of working on substrings.
+"""
+
+import numpy as np
+
+ALPHABET = "ACGT"
+AMBIGUOUS = 4
+
+_ENCODE_TABLE = np.full(256, AMBIGUOUS, dtype=np.uint8)
+for _code, _letter in enumerate(ALPHABET):
+    _ENCODE_TABLE[ord(_letter)] = _code
+    _ENCODE_TABLE[ord(_letter.lower())] = _code
+_ENCODE_TABLE[ord("U")] = 3
+_ENCODE_TABLE[ord("u")] = 3
+
+_DECODE_TABLE = np.frombuffer(b"ACGTN", dtype=np.uint8)
+
+
+def encode_sequence(sequence):
+    """Converts a DNA/RNA string (or bytes) into a uint8 array of codes 0-4."""
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+    return _ENCODE_TABLE[np.frombuffer(sequence, dtype=np.uint8)]
+
+
+def decode_codes(codes):
+    """Converts an array of codes 0-4 back into a DNA string (4 becomes N)."""
+    codes = np.minimum(np.asarray(codes, dtype=np.uint8), AMBIGUOUS)
+    return _DECODE_TABLE[codes].tobytes().decode("ascii")
+
+
+def pack_codes(codes):
+    """Packs codes 0-3 four per byte, first base in the two high bits."""
+    codes = np.asarray(codes, dtype=np.uint8) & 3
+    padding = (-len(codes)) % 4
+    if padding:
+        codes = np.concatenate([codes, np.zeros(padding, dtype=np.uint8)])
+    quads = codes.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+def unpack_codes(packed, length, first=0):
+    """Unpacks `length` codes starting at base `first` from a packed array."""
+    start_byte = first // 4
+    end_byte = (first + length + 3) // 4
+    chunk = np.asarray(packed[start_byte:end_byte], dtype=np.uint8)
+    codes = np.empty((len(chunk), 4), dtype=np.uint8)
+    codes[:, 0] = chunk >> 6
+    codes[:, 1] = (chunk >> 4) & 3
+    codes[:, 2] = (chunk >> 2) & 3
+    codes[:, 3] = chunk & 3
+    skip = first - start_byte * 4
+    return codes.ravel()[skip:skip + length]
@@ -0,0 +1,387 @@
+"""
+Streaming FASTA reader.
+
+The file is read in fixed-size blocks and split into lines by hand, so at any
+moment only the current record and one block are held in memory, no matter how
+large the multi-FASTA file is.
+
+Every record is returned as a tuple (id, description, sequence):
+    id          - first word of the header line (without '>')
+    description - the rest of the header line
+    sequence    - all sequence lines of the record joined together
+
+Files without a header line (plain sequence files) give a single record with
+an empty id and description.
+
+For random access there is also a faidx-style index (<file>.fai, the same
+columns samtools uses): per record its name, length, byte offset of the first
+base, bases per line and bytes per line. It is built once, rebuilt only when
+the FASTA file is newer, and lets fetch_region() seek straight to a region.
+
+Compressed input is opened transparently: plain gzip goes through the gzip
+module, and BGZF files (gzip made of independent blocks, as written by bgzip)
+are inflated in batches of blocks on a thread pool. The index only works on
+uncompressed files.
+"""
+
+import gzip
+import io
+import itertools
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+BLOCK_SIZE = 1 << 16  # 64 KiB per read() call
+BGZF_BATCH_BLOCKS = 64  # BGZF blocks inflated together (at most 64 KiB each)
+COMPRESSED_SUFFIXES = (".gz", ".bgz")
+FASTA_EXTENSIONS = (".fasta", ".fa", ".fna", ".txt")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def fasta_patterns():
+    """Glob patterns for every FASTA extension, plain and compressed."""
+    return [f"*{ext}{gz}" for ext in FASTA_EXTENSIONS for gz in ("",) + COMPRESSED_SUFFIXES]
+
+
+def fasta_label(filepath):
+    """File name without the compression suffix and the FASTA extension."""
+    name = os.path.basename(filepath)
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def _bgzf_block_size(header):
+    """Returns the total block size from a gzip header, or None if it is not BGZF."""
+    if len(header) < 12 or header[:4] != b"\x1f\x8b\x08\x04":
+        return None
+    xlen = struct.unpack("<H", header[10:12])[0]
+    extra = header[12:12 + xlen]
+    pos = 0
+    while pos + 4 <= len(extra):
+        si1, si2, slen = extra[pos], extra[pos + 1], struct.unpack("<H", extra[pos + 2:pos + 4])[0]
+        if si1 == 66 and si2 == 67 and slen == 2:
+            return struct.unpack("<H", extra[pos + 4:pos + 6])[0] + 1
+        pos += 4 + slen
+    return None
+
+
+def _inflate_block(block):
+    """Inflates the deflate payload of one BGZF block and checks its CRC."""
+    payload, crc, size = block
+    data = zlib.decompress(payload, -15)
+    if len(data) != size or zlib.crc32(data) != crc:
+        raise ValueError("corrupted BGZF block")
+    return data
+
+
+class BgzfReader(io.RawIOBase):
+    """Raw reader that inflates BGZF blocks in parallel, batch by batch."""
+
+    def __init__(self, filepath, threads=None, batch_blocks=BGZF_BATCH_BLOCKS):
+        self._raw = open(filepath, "rb")
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._batch_blocks = batch_blocks
+        self._buffer = b""
+        self._pos = 0
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _next_block(self):
+        header = self._raw.read(12)
+        if not header:
+            return None
+        xlen = struct.unpack("<H", header[10:12])[0] if len(header) == 12 else 0
+        header += self._raw.read(xlen)
+        total = _bgzf_block_size(header)
+        if total is None:
+            raise ValueError("not a BGZF block")
+        rest = self._raw.read(total - len(header))
+        crc, size = struct.unpack("<II", rest[-8:])
+        return rest[:-8], crc, size
+
+    def _fill(self):
+        blocks = []
+        while len(blocks) < self._batch_blocks:
+            block = self._next_block()
+            if block is None:
+                break
+            blocks.append(block)
+        if not blocks:
+            self._eof = True
+            return
+        self._buffer = b"".join(self._pool.map(_inflate_block, blocks))
+        self._pos = 0
+
+    def readinto(self, b):
+        while self._pos >= len(self._buffer):
+            if self._eof:
+                return 0
+            self._fill()
+        n = min(len(b), len(self._buffer) - self._pos)
+        b[:n] = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._pool.shutdown()
+            self._raw.close()
+        super().close()
+
+
+def is_compressed(filepath):
+    """True when the file starts with the gzip magic bytes (gzip or BGZF)."""
+    with open(filepath, "rb") as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def open_fasta(filepath, threads=None):
+    """Opens a plain, gzip or BGZF FASTA file for reading as text."""
+    with open(filepath, "rb") as f:
+        header = f.read(512)
+    if not header.startswith(_GZIP_MAGIC):
+        return open(filepath, "r")
+    if _bgzf_block_size(header) is not None:
+        return io.TextIOWrapper(io.BufferedReader(BgzfReader(filepath, threads)))
+    return gzip.open(filepath, "rt")
+
+
+def _parse_header(line):
+    """Splits a '>' header line into (id, description)."""
+    parts = line[1:].strip().split(None, 1)
+    if not parts:
+        return "", ""
+    if len(parts) == 1:
+        return parts[0], ""
+    return parts[0], parts[1]
+
+
+def _read_lines(filepath, block_size):
+    """Yields the stripped, non-empty, non-comment lines, reading block by block."""
+    # the pieces of an unfinished line are kept in a list and joined once, when its
+    # newline arrives, so a record written on a single line is read in linear time
+    tail = []
+    with open_fasta(filepath) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines = block.split("\n")
+            if len(lines) == 1:
+                tail.append(block)
+                continue
+            if tail:
+                tail.append(lines[0])
+                lines[0] = "".join(tail)
+            tail = [lines.pop()]
+            for line in lines:
+                line = line.strip()
+                if line and not line.startswith(";"):
+                    yield line
+    tail = "".join(tail).strip()
+    if tail and not tail.startswith(";"):
+        yield tail
+
+
+def read_fasta_records(filepath, block_size=BLOCK_SIZE):
+    """Yields (id, description, sequence) for every record of a FASTA file."""
+    record_id, description = None, None
+    chunks = []
+
+    for line in _read_lines(filepath, block_size):
+        if line.startswith(">"):
+            if record_id is not None or chunks:
+                yield record_id or "", description or "", "".join(chunks)
+            record_id, description = _parse_header(line)
+            chunks = []
+        else:
+            chunks.append(line)
+
+    if record_id is not None or chunks:
+        yield record_id or "", description or "", "".join(chunks)
+
+
+def _line_pieces(filepath, block_size):
+    """Yields (piece, starts_line) for every line, block by block.
+
+    A line running past the end of a block is handed out in several pieces, of
+    which only the first has starts_line True, so no piece is longer than a block.
+    """
+    at_line_start = True
+    with open_fasta(filepath) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines = block.split("\n")
+            last = len(lines) - 1
+            for i, line in enumerate(lines):
+                if line:
+                    yield line, at_line_start
+                    at_line_start = False
+                if i < last:
+                    at_line_start = True
+
+
+def read_fasta_chunks(filepath, block_size=BLOCK_SIZE):
+    """Yields (id, piece, first) with each record cut into ~block_size pieces.
+
+    Unlike read_fasta_records, not even one whole record (or one whole line of
+    an unwrapped record) is kept in memory: pieces are at most about two blocks
+    long. first is True for the first piece of every record, so a consumer
+    knows where one record ends and the next begins.
+    """
+    record_id = None
+    chunks = []
+    size = 0
+    first = True
+    header = None  # pieces of the header line being read
+    kind = None  # ">" header, ";" comment or "" sequence, for the current line
+
+    # the sentinel starts one last empty line, which completes a header at the end
+    for piece, starts_line in itertools.chain(_line_pieces(filepath, block_size), [("", True)]):
+        if starts_line:
+            if header is not None:
+                if chunks or (record_id is not None and first):
+                    yield record_id or "", "".join(chunks), first
+                record_id, _ = _parse_header("".join(header).strip())
+                chunks, size, first = [], 0, True
+                header = None
+            kind = None
+        if kind is None:
+            stripped = piece.lstrip()
+            if not stripped:
+                continue
+            kind = stripped[0] if stripped[0] in (">", ";") else ""
+            if kind == ">":
+                header = []
+        if kind == ">":
+            header.append(piece)
+            continue
+        piece = piece.strip()
+        if kind == ";" or not piece:
+            continue
+        chunks.append(piece)
+        size += len(piece)
+        if size >= block_size:
+            yield record_id or "", "".join(chunks), first
+            chunks, size, first = [], 0, False
+
+    if chunks or (record_id is not None and first):
+        yield record_id or "", "".join(chunks), first
+
+
+def read_fasta_sequence(filepath, block_size=BLOCK_SIZE):
+    """Returns the sequences of all records in the file joined into one string."""
+    return "".join(seq for _, _, seq in read_fasta_records(filepath, block_size))
+
+
+def _index_path(filepath):
+    return filepath + ".fai"
+
+
+def build_fasta_index(filepath):
+    """Scans a FASTA file once and writes its .fai index. Returns the index."""
+    if is_compressed(filepath):
+        raise ValueError(f"{filepath} is compressed; only plain FASTA files can be indexed")
+    default_name = os.path.splitext(os.path.basename(filepath))[0]
+    index = {}
+    entry = None
+
+    def finish(entry):
+        if entry is not None:
+            index[entry["name"]] = entry
+
+    with open(filepath, "rb") as f:
+        offset = 0
+        short_line_seen = False
+        blank_line_seen = False
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if line.startswith(b">"):
+                finish(entry)
+                name, _ = _parse_header(line.decode("ascii", "replace"))
+                entry = {"name": name or default_name, "length": 0, "offset": offset,
+                         "line_bases": 0, "line_width": 0}
+                short_line_seen = False
+                blank_line_seen = False
+                continue
+
+            bases = len(line.rstrip(b"\r\n"))
+            if bases == 0:
+                # a blank line is only allowed at the end of a record, as in samtools faidx
+                if entry is not None and entry["length"] > 0:
+                    blank_line_seen = True
+                continue
+            if blank_line_seen:
+                raise ValueError(f"{filepath}: record '{entry['name']}' has a blank line inside its sequence")
+            if entry is None:
+                entry = {"name": default_name, "length": 0, "offset": line_offset,
+                         "line_bases": 0, "line_width": 0}
+            if entry["line_bases"] == 0:
+                entry["offset"] = line_offset  # blank lines may sit between the header and the sequence
+                entry["line_bases"] = bases
+                entry["line_width"] = len(line)
+            elif short_line_seen or bases > entry["line_bases"]:
+                raise ValueError(f"{filepath}: record '{entry['name']}' has lines of different lengths")
+            elif bases < entry["line_bases"]:
+                short_line_seen = True
+            entry["length"] += bases
+        finish(entry)
+
+    with open(_index_path(filepath), "w") as out:
+        for e in index.values():
+            out.write(f"{e['name']}\t{e['length']}\t{e['offset']}\t{e['line_bases']}\t{e['line_width']}\n")
+    return index
+
+
+def load_fasta_index(filepath):
+    """Returns {name: entry} from the .fai file, building it when missing or stale."""
+    index_path = _index_path(filepath)
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(filepath):
+        return build_fasta_index(filepath)
+
+    index = {}
+    with open(index_path, "r") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            name = fields[0]
+            length, offset, line_bases, line_width = (int(x) for x in fields[1:5])
+            index[name] = {"name": name, "length": length, "offset": offset,
+                           "line_bases": line_bases, "line_width": line_width}
+    return index
+
+
+def fetch_region(filepath, name=None, start=0, end=None, index=None):
+    """Returns sequence[start:end] of one record by seeking, in O(region) time.
+
+    When name is None the first record of the file is used.
+    """
+    if index is None:
+        index = load_fasta_index(filepath)
+    entry = index[name] if name is not None else next(iter(index.values()))
+
+    length = entry["length"]
+    end = length if end is None else min(end, length)
+    start = max(0, start)
+    if end <= start:
+        return ""
+
+    line_bases, line_width = entry["line_bases"], entry["line_width"]
+
+    def byte_position(base):
+        return entry["offset"] + (base // line_bases) * line_width + base % line_bases
+
+    with open(filepath, "rb") as f:
+        f.seek(byte_position(start))
+        raw = f.read(byte_position(end - 1) - byte_position(start) + 1)
+    return raw.replace(b"\n", b"").replace(b"\r", b"").decode("ascii")
@@ -0,0 +1,220 @@
+"""
+Suffix array and FM-index over a set of reads (Lab5).
+
+The reads are concatenated as  #r0#r1#...#rN$  with the bases coded 2-6
+(A C G T, other), '#' = 1 and the final '$' = 0, so the suffix order equals
+the rotation order and the Burrows-Wheeler transform works directly. The
+suffix array is built by prefix doubling: every round sorts the suffixes by
+the ranks of their first 2h symbols with one argsort, starting from the first
+21 symbols packed into one integer, so it takes log2(longest repeat / 21)
+rounds.
+
+Overlaps are found the way an FM-index assembler does it: every read is
+searched backwards from its last base, so after s steps the search interval
+holds the occurrences of its suffix of length s. Extending that interval by
+'#' leaves exactly the reads that start with the same s bases. All reads are
+stepped together, one array operation per step, so listing every suffix-prefix
+overlap takes (length of the longest read) passes.
+
+Usage:
+    python -m bioutils.fmindex <reads.fasta> <index.npz> [min_overlap]
+"""
+
+import sys
+
+import numpy as np
+
+from bioutils.encoding import encode_sequence
+from bioutils.fasta import read_fasta_records
+
+TERMINATOR = 0
+SEPARATOR = 1
+SIGMA = 7  # $, #, A, C, G, T, other
+
+OVERLAP_DTYPE = np.dtype([("source", np.int64), ("target", np.int64), ("length", np.int64)])
+
+
+def _reads_text(fragments):
+    """(text, read starts) of '#r0#r1...#rN$' as symbol codes."""
+    codes = [encode_sequence(fragment) + 2 for fragment in fragments]
+    lengths = np.array([len(c) for c in codes], dtype=np.int64)
+    starts = np.cumsum(np.concatenate([[1], lengths[:-1] + 1])) if len(codes) else np.empty(0, dtype=np.int64)
+    text = np.full(int(lengths.sum()) + len(codes) + 1, SEPARATOR, dtype=np.uint8)
+    for start, c in zip(starts, codes):
+        text[start:start + len(c)] = c
+    text[-1] = TERMINATOR
+    return text, starts
+
+
+def _packed_ranks(text):
+    """(ranks, h): ranks of all suffixes by their first h symbols, packed into one int64."""
+    n = len(text)
+    bits = max(int(text.max(initial=0)) + 1, 1).bit_length()
+    h = max(63 // bits, 1)
+    # symbol + 1 so that running past the end sorts before every symbol
+    padded = np.zeros(n + h, dtype=np.int64)
+    padded[:n] = text.astype(np.int64) + 1
+    key = np.zeros(n, dtype=np.int64)
+    for j in range(h):
+        key <<= bits
+        key |= padded[j:j + n]
+    _, ranks = np.unique(key, return_inverse=True)
+    return ranks.reshape(-1).astype(np.int64), h
+
+
+def suffix_array(text):
+    """Suffix array of a small-alphabet integer text by prefix doubling."""
+    n = len(text)
+    rank, h = _packed_ranks(text)
+    while True:
+        if rank.max(initial=0) == n - 1 or h >= n:
+            return np.argsort(rank, kind="stable")
+        # rank of the suffix h positions further, -1 past the end
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - h] = rank[h:]
+        key = rank * (n + 1) + second + 1
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.concatenate([[0], np.cumsum(sorted_key[1:] != sorted_key[:-1])])
+        h *= 2
+
+
+class FMIndex:
+    """Suffix array, BWT and occurrence table of a read set."""
+
+    # the arrays that define an index; everything else is derived from them
+    ARRAYS = ("text", "starts", "sa", "occ")
+
+    def __init__(self, fragments=None, text=None, starts=None, sa=None, occ=None):
+        if fragments is not None:
+            text, starts = _reads_text(fragments)
+        self.text = text
+        self.starts = starts
+        self.sa = suffix_array(text) if sa is None else sa
+        self.lengths = np.diff(np.append(starts, len(text))) - 1
+        counts = np.bincount(text, minlength=SIGMA)
+        self.first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        if occ is None:
+            bwt = text[self.sa - 1]  # sa == 0 wraps to the final '$'
+            # occ[c, i] = number of c in bwt[:i]
+            occ = np.zeros((SIGMA, len(text) + 1), dtype=np.int32 if len(text) < 2 ** 31 else np.int64)
+            for c in range(SIGMA):
+                np.cumsum(bwt == c, out=occ[c, 1:])
+        self.occ = occ
+
+    def arrays(self):
+        """{name: array} of ARRAYS, enough to rebuild the index with FMIndex(**arrays)."""
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def save(self, path):
+        """Writes the text, read starts and suffix array to an .npz file."""
+        np.savez(path, text=self.text, starts=self.starts, sa=self.sa)
+
+    @classmethod
+    def load(cls, path):
+        """Reopens an index written by save (the BWT and occ table are rebuilt)."""
+        with np.load(path) as data:
+            return cls(text=data["text"], starts=data["starts"], sa=data["sa"])
+
+    def read(self, i):
+        """Sequence of read i."""
+        codes = self.text[self.starts[i]:self.starts[i] + self.lengths[i]]
+        return np.frombuffer(b"ACGTN", dtype=np.uint8)[codes - 2].tobytes().decode("ascii")
+
+    def _extend(self, symbols, lo, hi):
+        return self.first[symbols] + self.occ[symbols, lo], self.first[symbols] + self.occ[symbols, hi]
+
+    def interval(self, pattern):
+        """[lo, hi) suffix array interval of the occurrences of pattern."""
+        lo, hi = 0, len(self.text)
+        for symbol in (encode_sequence(pattern) + 2)[::-1]:
+            lo, hi = self._extend(int(symbol), lo, hi)
+            if lo >= hi:
+                return 0, 0
+        return int(lo), int(hi)
+
+    def locate(self, pattern):
+        """(read, offset) of every occurrence of pattern, sorted."""
+        lo, hi = self.interval(pattern)
+        positions = np.sort(self.sa[lo:hi])
+        reads = np.searchsorted(self.starts, positions, side="right") - 1
+        return np.stack([reads, positions - self.starts[reads]], axis=1)
+
+    def occurrences(self, sources=None):
+        """Number of times each read (all, or the ids in sources) occurs in the read set.
+
+        A read seen more often than it has identical copies is contained in a
+        longer read.
+        """
+        reads = np.arange(len(self.starts)) if sources is None else np.asarray(sources, dtype=np.int64)
+        lo = np.zeros(len(reads), dtype=np.int64)
+        hi = np.full(len(reads), len(self.text), dtype=np.int64)
+        lengths = self.lengths[reads]
+        for step in range(1, int(lengths.max(initial=0)) + 1):
+            searching = lengths >= step
+            symbols = self.text[self.starts[reads[searching]] + lengths[searching] - step]
+            lo[searching], hi[searching] = self._extend(symbols, lo[searching], hi[searching])
+        return hi - lo
+
+    def overlaps(self, min_overlap=11, sources=None):
+        """Every pair of reads where a proper suffix of source equals a prefix of target.
+
+        Only the longest overlap of each (source, target) pair is listed; the
+        result is an array of OVERLAP_DTYPE records sorted by source, target.
+        sources limits the search to some source reads (targets are always all
+        reads), so the work can be split between processes.
+        """
+        reads = np.arange(len(self.starts)) if sources is None else np.asarray(sources, dtype=np.int64)
+        lo = np.zeros(len(self.starts), dtype=np.int64)
+        hi = np.full(len(self.starts), len(self.text), dtype=np.int64)
+        found = []
+        for step in range(1, int(self.lengths[reads].max(initial=0))):
+            # reads still searching: a proper suffix of this length exists and occurs somewhere
+            reads = reads[self.lengths[reads] > step]
+            if len(reads) == 0:
+                break
+            symbols = self.text[self.starts[reads] + self.lengths[reads] - step]
+            lo_r, hi_r = self._extend(symbols, lo[reads], hi[reads])
+            lo[reads], hi[reads] = lo_r, hi_r
+            alive = lo_r < hi_r
+            reads, lo_r, hi_r = reads[alive], lo_r[alive], hi_r[alive]
+            if step < min_overlap:
+                continue
+
+            # the occurrences preceded by '#' are read starts
+            sep_lo, sep_hi = self._extend(SEPARATOR, lo_r, hi_r)
+            width = sep_hi - sep_lo
+            hits = width > 0
+            if not hits.any():
+                continue
+            width, sep_lo = width[hits], sep_lo[hits]
+            sources = np.repeat(reads[hits], width)
+            rows = np.repeat(sep_lo - np.cumsum(width) + width, width) + np.arange(width.sum())
+            targets = np.searchsorted(self.starts, self.sa[rows] + 1)
+            block = np.empty(len(sources), dtype=OVERLAP_DTYPE)
+            block["source"], block["target"], block["length"] = sources, targets, step
+            found.append(block[sources != targets])
+
+        if not found:
+            return np.empty(0, dtype=OVERLAP_DTYPE)
+        pairs = np.concatenate(found)
+        # steps only grow, so the last entry of every pair is its longest overlap
+        pairs = pairs[np.lexsort((pairs["length"], pairs["target"], pairs["source"]))]
+        last = np.ones(len(pairs), dtype=bool)
+        last[:-1] = (pairs["source"][1:] != pairs["source"][:-1]) | (pairs["target"][1:] != pairs["target"][:-1])
+        return pairs[last]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m bioutils.fmindex <reads.fasta> <index.npz> [min_overlap]")
+        sys.exit(1)
+    index = FMIndex([sequence for _, _, sequence in read_fasta_records(sys.argv[1])])
+    index.save(sys.argv[2])
+    min_overlap = int(sys.argv[3]) if len(sys.argv) > 3 else 11
+    print(f"{len(index)} reads, {len(index.text)} symbols, "
+          f"{len(index.overlaps(min_overlap))} overlaps of at least {min_overlap} bases")
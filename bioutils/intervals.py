@@ -0,0 +1,52 @@
+"""
+Above-threshold regions of a signal.
+
+Turns a signal (Tm profile, PWM scores, CG%/IC, ...) into a compact list of
+intervals with one vectorized run-length pass instead of a Python loop over
+every point. Each interval is a record (start, end, max, mean) with start and
+end as indices into the signal, end exclusive.
+
+With a low_threshold the extraction has hysteresis: a region opens where the
+signal goes above threshold and stays open until the signal drops to
+low_threshold or below, so noise around the threshold does not split it into
+many small pieces.
+"""
+
+import numpy as np
+
+INTERVAL_DTYPE = np.dtype([("start", np.int64), ("end", np.int64), ("max", np.float64), ("mean", np.float64)])
+
+
+def _runs(mask):
+    """Start and (exclusive) end index of every run of True values."""
+    edges = np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def signal_intervals(signal, threshold, low_threshold=None, min_length=1):
+    """Regions where signal > threshold, as an array of INTERVAL_DTYPE records."""
+    signal = np.asarray(signal, dtype=np.float64)
+    if low_threshold is None or low_threshold >= threshold:
+        starts, ends = _runs(signal > threshold)
+    else:
+        starts, ends = _runs(signal > low_threshold)
+        # a region only opens at the first point above the high threshold in each run
+        above = np.flatnonzero(signal > threshold)
+        first = np.searchsorted(above, starts)
+        first_above = above[np.minimum(first, len(above) - 1)] if len(above) else np.full(len(starts), -1)
+        keep = (first < len(above)) & (first_above < ends) if len(above) else np.zeros(len(starts), dtype=bool)
+        starts, ends = first_above[keep], ends[keep]
+
+    long_enough = ends - starts >= min_length
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    intervals = np.empty(len(starts), dtype=INTERVAL_DTYPE)
+    intervals["start"] = starts
+    intervals["end"] = ends
+    if len(starts):
+        # reduceat over [start, end, start, end, ...] gives each interval at the even slots
+        bounds = np.column_stack([starts, ends]).ravel()
+        padded = np.append(signal, 0.0)
+        intervals["max"] = np.maximum.reduceat(padded, bounds)[::2]
+        intervals["mean"] = np.add.reduceat(padded, bounds)[::2] / (ends - starts)
+    return intervals
@@ -0,0 +1,149 @@
+"""
+Vectorized k-mer counting.
+
+The sequence is encoded as integers 0-3 and every k-mer becomes one base-4
+number (A=0, C=1, G=2, T=3, first base most significant), built for all
+positions at once with a rolling shift-and-add. Counting is then a single
+bincount. Windows that contain N or another ambiguity letter are skipped.
+
+For k <= DENSE_MAX_K the counts come back as a dense array of length 4**k,
+indexed by the k-mer number. Above that a dense array would be too large, so
+a sparse pair (sorted k-mer numbers, counts) is returned instead.
+
+With canonical=True each k-mer is folded with its reverse complement (the
+smaller of the two numbers is kept), so both strands give the same counts.
+The reverse-complement number is rolled in the same loop as the forward one,
+so there is no second pass over the sequence.
+"""
+
+import itertools
+
+import numpy as np
+
+from bioutils.encoding import ALPHABET, AMBIGUOUS, encode_sequence
+
+DENSE_MAX_K = 12
+MAX_K = 31  # 4**31 still fits in an int64
+
+
+def _as_codes(sequence):
+    if isinstance(sequence, np.ndarray):
+        return sequence
+    return encode_sequence(sequence)
+
+
+def rolling_kmers(sequence, k, with_reverse=True):
+    """k-mer numbers at every position: (forward, reverse_complement, valid).
+
+    Unlike kmer_values nothing is filtered out; valid is False for windows
+    that contain an ambiguous base. reverse_complement is None when
+    with_reverse is False.
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    codes = _as_codes(sequence)
+    n_windows = max(0, len(codes) - k + 1)
+
+    # k-mers are built by doubling: 2-mers from 1-mers, 4-mers from 2-mers, ...,
+    # and the blocks matching the binary digits of k are appended to the result,
+    # so there are about 2 log2(k) passes over the sequence instead of k
+    bases = (codes & 3).astype(np.int64)
+    block, block_reverse = bases, (3 - bases) if with_reverse else None
+    values = reverse = None
+    size, width, remaining = 1, 0, k
+    while True:
+        if remaining & 1:
+            if values is None:
+                values, reverse = block, block_reverse
+            else:
+                length = max(len(values) - size, 0)
+                tail = block[width:width + length]
+                values = (values[:length] << (2 * size)) | tail
+                if with_reverse:
+                    # the reverse complement of the appended block comes first
+                    reverse = (block_reverse[width:width + length] << (2 * width)) | reverse[:length]
+            width += size
+        remaining >>= 1
+        if not remaining:
+            break
+        block = (block[:-size] << (2 * size)) | block[size:]
+        if with_reverse:
+            block_reverse = (block_reverse[size:] << (2 * size)) | block_reverse[:-size]
+        size *= 2
+    values = values[:n_windows]
+    if with_reverse:
+        reverse = reverse[:n_windows]
+
+    ambiguous = np.concatenate([[0], np.cumsum(codes == AMBIGUOUS)])
+    valid = ambiguous[k:k + n_windows] == ambiguous[:n_windows]
+    return values, reverse, valid
+
+
+def kmer_values(sequence, k, canonical=False):
+    """Base-4 number of every k-mer without ambiguous bases, in sequence order."""
+    values, reverse, valid = rolling_kmers(sequence, k, with_reverse=canonical)
+    if canonical:
+        np.minimum(values, reverse, out=values)
+    return values[valid]
+
+
+def reverse_complement_values(values, k):
+    """Reverse-complement k-mer numbers of an array of k-mer numbers."""
+    values = np.asarray(values, dtype=np.int64)
+    reverse = np.zeros_like(values)
+    for _ in range(k):
+        reverse <<= 2
+        reverse |= 3 - (values & 3)
+        values = values >> 2
+    return reverse
+
+
+def kmer_counts(sequence, k, canonical=False):
+    """Counts every k-mer (overlapping occurrences included).
+
+    Returns a dense array of length 4**k for k <= DENSE_MAX_K, otherwise a
+    pair (kmers, counts) of the k-mers that occur, sorted by k-mer number.
+    In canonical mode only canonical k-mers get counts.
+    """
+    values = kmer_values(sequence, k, canonical)
+    if k <= DENSE_MAX_K:
+        return np.bincount(values, minlength=4 ** k)
+    return np.unique(values, return_counts=True)
+
+
+def decode_kmer(value, k):
+    """Turns a k-mer number back into its string."""
+    letters = []
+    for _ in range(k):
+        letters.append(ALPHABET[value & 3])
+        value >>= 2
+    return "".join(reversed(letters))
+
+
+def kmer_labels(k):
+    """All 4**k k-mer strings, in the same order as the dense counts."""
+    return ["".join(p) for p in itertools.product(ALPHABET, repeat=k)]
+
+
+def kmer_count_dict(sequence, k, include_missing=False, canonical=False):
+    """{kmer: count}; with include_missing every possible (canonical) k-mer is listed."""
+    counts = kmer_counts(sequence, k, canonical)
+    if k <= DENSE_MAX_K:
+        if include_missing:
+            indices = np.arange(4 ** k)
+            if canonical:
+                indices = indices[indices <= reverse_complement_values(indices, k)]
+        else:
+            indices = np.flatnonzero(counts)
+        return {decode_kmer(int(i), k): int(counts[i]) for i in indices}
+    kmers, values = counts
+    return {decode_kmer(int(v), k): int(c) for v, c in zip(kmers, values)}
+
+
+def kmer_percentages(sequence, k, include_missing=False, digits=2, canonical=False):
+    """{kmer: percentage of all k-mers}, rounded like the lab outputs."""
+    counts = kmer_count_dict(sequence, k, include_missing, canonical)
+    total = sum(counts.values())
+    if total == 0:
+        return {kmer: 0.0 for kmer in counts}
+    return {kmer: round(count / total * 100, digits) for kmer, count in counts.items()}
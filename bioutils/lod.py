@@ -0,0 +1,94 @@
+"""
+Level-of-detail plotting for long signals.
+
+A chromosome-length signal has far more points than the chart has pixels, so
+drawing all of them only costs time and memory. SignalPyramid keeps an M4
+decimation of the signal at every power-of-two bucket size: for each bucket
+the index of its minimum and maximum (the first and last points are the bucket
+bounds). Every level is built from the one below by merging bucket pairs, so
+the whole pyramid costs O(n) once.
+
+view() returns, for an x range and a number of pixels, only the first, min,
+max and last point of each bucket at the coarsest level that still has at
+least one bucket per pixel. Peaks and dips are never lost, and a zoomed-in
+range gets a finer level without touching the sequence again. plot_lod() draws
+a signal this way and swaps levels whenever the x limits change.
+"""
+
+import numpy as np
+
+# below this many points per pixel the raw samples are drawn
+MIN_BUCKET = 4
+
+
+class SignalPyramid:
+    """Multi-resolution min/max index pyramid of one signal."""
+
+    def __init__(self, x, y):
+        self.y = np.asarray(y, dtype=np.float64)
+        self.x = np.arange(len(self.y)) if x is None else np.asarray(x)
+        # levels[j] = (min_idx, max_idx) for buckets of MIN_BUCKET * 2**j points
+        self.levels = []
+        n = len(self.y)
+        size = MIN_BUCKET
+        if n > size:
+            pad = -n % size
+            idx = np.concatenate([np.arange(n), np.full(pad, n - 1)]).reshape(-1, size)
+            values = self.y[idx]
+            rows = np.arange(len(idx))
+            level = (idx[rows, values.argmin(axis=1)], idx[rows, values.argmax(axis=1)])
+            self.levels.append(level)
+            while len(level[0]) > 1:
+                level = self._merge(*level)
+                self.levels.append(level)
+
+    def _merge(self, min_idx, max_idx):
+        if len(min_idx) % 2:
+            min_idx = np.append(min_idx, min_idx[-1])
+            max_idx = np.append(max_idx, max_idx[-1])
+        a, b = min_idx[0::2], min_idx[1::2]
+        merged_min = np.where(self.y[b] < self.y[a], b, a)
+        a, b = max_idx[0::2], max_idx[1::2]
+        merged_max = np.where(self.y[b] > self.y[a], b, a)
+        return merged_min, merged_max
+
+    def __len__(self):
+        return len(self.y)
+
+    def view(self, xmin=None, xmax=None, pixels=1000):
+        """(x, y) of the points to draw for the range [xmin, xmax] on `pixels` pixels."""
+        n = len(self.y)
+        lo = 0 if xmin is None else max(int(np.searchsorted(self.x, xmin, side="right")) - 1, 0)
+        hi = n if xmax is None else min(int(np.searchsorted(self.x, xmax, side="left")) + 1, n)
+        points_per_pixel = (hi - lo) / max(pixels, 1)
+        if points_per_pixel < MIN_BUCKET or not self.levels:
+            return self.x[lo:hi], self.y[lo:hi]
+
+        # coarsest level with bucket size <= points per pixel
+        j = min(int(np.log2(points_per_pixel / MIN_BUCKET)), len(self.levels) - 1)
+        size = MIN_BUCKET << j
+        min_idx, max_idx = self.levels[j]
+        first, last = lo // size, (hi - 1) // size + 1
+        starts = np.arange(first, last) * size
+        ends = np.minimum(starts + size, n) - 1
+        idx = np.concatenate([starts, min_idx[first:last], max_idx[first:last], ends])
+        # edge buckets may reach past the range; matplotlib clips those points
+        idx = np.unique(idx)
+        return self.x[idx], self.y[idx]
+
+
+def _axes_pixels(ax):
+    return max(int(ax.get_window_extent().width), 1)
+
+
+def plot_lod(ax, x, y, *args, pyramid=None, **kwargs):
+    """ax.plot() for long signals: draws a pixel-sized view and refines it on zoom."""
+    pyramid = pyramid if pyramid is not None else SignalPyramid(x, y)
+    line, = ax.plot(*pyramid.view(pixels=_axes_pixels(ax)), *args, **kwargs)
+
+    def refresh(axes):
+        xmin, xmax = axes.get_xlim()
+        line.set_data(*pyramid.view(xmin, xmax, _axes_pixels(axes)))
+
+    ax.callbacks.connect("xlim_changed", refresh)
+    return line
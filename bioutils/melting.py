@@ -0,0 +1,150 @@
+"""
+Vectorized melting-temperature (Tm) profiles.
+
+Both Lab3 formulas only need the number of G+C and A+T bases in a window:
+
+    simple (Wallace):  Tm = 4(G + C) + 2(A + T)
+    alternative:       Tm = 81.5 + 16.6 log10([Na+]) + 0.41 (%GC) - 600 / length
+
+Two prefix sums (G+C and A+T) are built once over the encoded sequence; every
+window of every requested size is then a difference of two prefix values, so a
+multi-scale profile of a whole genome costs a single scan.
+
+The composition formulas ignore base stacking, so there is also a
+nearest-neighbor model (SantaLucia 1998 unified parameters): every
+dinucleotide step becomes an index 0-15 into delta-H / delta-S tables, the
+step values are prefix-summed, and each window's totals are again one
+difference. Tm = 1000 dH / (dS + R ln(CT / 4)) - 273.15, with the entropy
+salt correction dS += 0.368 (N - 1) ln[Na+]. The symmetry correction for
+self-complementary windows is not applied.
+"""
+
+import math
+
+import numpy as np
+
+from bioutils.encoding import encode_sequence
+
+NA_PLUS = 0.001  # sodium concentration used in the labs
+NN_NA_PLUS = 0.05  # 50 mM Na+, a usual PCR buffer, for the nearest-neighbor model
+STRAND_CONC = 50e-9  # total strand concentration CT (M)
+GAS_CONSTANT = 1.987  # cal / (K mol)
+
+# SantaLucia (1998) unified nearest-neighbor parameters: step -> (dH kcal/mol, dS cal/(K mol))
+NN_STACKS = {
+    "AA": (-7.9, -22.2), "TT": (-7.9, -22.2),
+    "AT": (-7.2, -20.4),
+    "TA": (-7.2, -21.3),
+    "CA": (-8.5, -22.7), "TG": (-8.5, -22.7),
+    "GT": (-8.4, -22.4), "AC": (-8.4, -22.4),
+    "CT": (-7.8, -21.0), "AG": (-7.8, -21.0),
+    "GA": (-8.2, -22.2), "TC": (-8.2, -22.2),
+    "CG": (-10.6, -27.2),
+    "GC": (-9.8, -24.4),
+    "GG": (-8.0, -19.9), "CC": (-8.0, -19.9),
+}
+NN_INIT_GC = (0.1, -2.8)  # per terminal G or C
+NN_INIT_AT = (2.3, 4.1)  # per terminal A or T
+
+# the same tables indexed by step number 4 * first + second (A=0, C=1, G=2, T=3)
+_STEP_DH = np.array([NN_STACKS[a + b][0] for a in "ACGT" for b in "ACGT"])
+_STEP_DS = np.array([NN_STACKS[a + b][1] for a in "ACGT" for b in "ACGT"])
+_TERMINAL_DH = np.array([NN_INIT_AT[0], NN_INIT_GC[0], NN_INIT_GC[0], NN_INIT_AT[0], 0.0])
+_TERMINAL_DS = np.array([NN_INIT_AT[1], NN_INIT_GC[1], NN_INIT_GC[1], NN_INIT_AT[1], 0.0])
+
+
+def melting_temperature_simple(G, C, A, T):
+    """Wallace formula; works on plain numbers and on NumPy arrays."""
+    return 4 * (G + C) + 2 * (A + T)
+
+
+def melting_temperature_alternative(CG_perc, length, na_plus=NA_PLUS):
+    """Salt-adjusted formula; works on plain numbers and on NumPy arrays."""
+    return 81.5 + 16.6 * math.log10(na_plus) + 0.41 * CG_perc - 600 / length
+
+
+def _prefix_sums(sequence):
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    gc = np.zeros(len(codes) + 1, dtype=np.int64)
+    at = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum((codes == 1) | (codes == 2), out=gc[1:])
+    np.cumsum((codes == 0) | (codes == 3), out=at[1:])
+    return gc, at
+
+
+def _profile(gc_prefix, at_prefix, window_size, step, na_plus):
+    length = len(gc_prefix) - 1
+    if length < window_size:
+        empty = np.empty(0)
+        return {"positions": np.empty(0, dtype=np.int64), "simple": empty, "alternative": empty}
+
+    last = (length - window_size) // step * step + 1
+    gc = gc_prefix[window_size:window_size + last:step] - gc_prefix[:last:step]
+    at = at_prefix[window_size:window_size + last:step] - at_prefix[:last:step]
+    return {
+        "positions": np.arange(1, last + 1, step, dtype=np.int64),  # 1-based window starts
+        "simple": melting_temperature_simple(gc, 0, at, 0).astype(np.float64),
+        "alternative": melting_temperature_alternative(gc / window_size * 100, window_size, na_plus),
+    }
+
+
+def tm_profile(sequence, window_size=9, step=1, na_plus=NA_PLUS):
+    """Tm of every window: dict with 'positions', 'simple' and 'alternative' arrays.
+
+    sequence is a string or an array of codes 0-4 (e.g. from GenomeStore.codes).
+    """
+    gc, at = _prefix_sums(sequence)
+    return _profile(gc, at, window_size, step, na_plus)
+
+
+def tm_profiles(sequence, window_sizes, step=1, na_plus=NA_PLUS):
+    """{window_size: profile} for several window sizes from one pass over the sequence."""
+    gc, at = _prefix_sums(sequence)
+    return {w: _profile(gc, at, w, step, na_plus) for w in window_sizes}
+
+
+def _nn_window_tm(dh, ds, window_size, na_plus, strand_conc):
+    ds = ds + 0.368 * (window_size - 1) * math.log(na_plus)
+    return 1000 * dh / (ds + GAS_CONSTANT * math.log(strand_conc / 4)) - 273.15
+
+
+def tm_nn_profile(sequence, window_size=20, step=1, na_plus=NN_NA_PLUS, strand_conc=STRAND_CONC):
+    """Nearest-neighbor Tm of every window: dict with 'positions', 'tm', 'dH', 'dS'.
+
+    Windows containing N or another ambiguity letter get NaN.
+    """
+    if window_size < 2:
+        raise ValueError("the nearest-neighbor model needs windows of at least 2 bases")
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    length = len(codes)
+    if length < window_size:
+        empty = np.empty(0)
+        return {"positions": np.empty(0, dtype=np.int64), "tm": empty, "dH": empty, "dS": empty}
+
+    steps = (codes[:-1].astype(np.int64) & 3) * 4 + (codes[1:] & 3)
+    dh_prefix = np.concatenate([[0.0], np.cumsum(_STEP_DH[steps])])
+    ds_prefix = np.concatenate([[0.0], np.cumsum(_STEP_DS[steps])])
+    bad_prefix = np.concatenate([[0], np.cumsum(codes == 4)])
+
+    last = (length - window_size) // step * step + 1
+    starts = slice(0, last, step)
+    ends = slice(window_size - 1, window_size - 1 + last, step)  # last base of each window
+
+    # a window of w bases has w - 1 steps: steps[start] .. steps[start + w - 2]
+    dh = dh_prefix[ends] - dh_prefix[starts]
+    ds = ds_prefix[ends] - ds_prefix[starts]
+    first_codes, last_codes = codes[starts], codes[ends]
+    dh = dh + _TERMINAL_DH[first_codes] + _TERMINAL_DH[last_codes]
+    ds = ds + _TERMINAL_DS[first_codes] + _TERMINAL_DS[last_codes]
+
+    tm = _nn_window_tm(dh, ds, window_size, na_plus, strand_conc)
+    ambiguous = bad_prefix[window_size:window_size + last:step] - bad_prefix[:last:step] > 0
+    tm[ambiguous] = np.nan
+    dh[ambiguous] = np.nan
+    ds[ambiguous] = np.nan
+    return {"positions": np.arange(1, last + 1, step, dtype=np.int64), "tm": tm, "dH": dh, "dS": ds}
+
+
+def melting_temperature_nearest_neighbor(sequence, na_plus=NN_NA_PLUS, strand_conc=STRAND_CONC):
+    """Nearest-neighbor Tm of a whole oligo (e.g. a primer)."""
+    return float(tm_nn_profile(sequence, len(sequence), 1, na_plus, strand_conc)["tm"][0])
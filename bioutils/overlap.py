@@ -0,0 +1,75 @@
+"""
+Overlap index for the greedy fragment assembler (Lab5).
+
+The assembler keeps extending a contig with the unused fragment whose prefix
+matches the longest suffix of the contig (at least min_overlap, at most
+max_overlap bases). Instead of testing every fragment at every overlap
+length, the fragments are indexed by their first min_overlap bases: for an
+overlap of length j the fragment must start with the min_overlap bases found
+j positions from the end of the contig, so each length is one dictionary
+lookup followed by a check of the few fragments found there.
+
+The contig is a growing bytearray and only its last max_overlap bytes are
+looked at, through memoryview slices, so a step costs the same however long
+the contig is and no fragment prefix is ever copied. Used fragments are
+marked in a bitmap.
+
+Ties are broken like the original loop: the longest overlap wins, then the
+fragment that comes first in the input.
+"""
+
+MIN_OVERLAP = 11
+MAX_OVERLAP = 100
+
+
+class OverlapIndex:
+    """Fragments indexed by their prefix, with a bitmap of the ones already used."""
+
+    def __init__(self, fragments, min_overlap=MIN_OVERLAP, max_overlap=MAX_OVERLAP):
+        self.fragments = [f.encode("ascii") if isinstance(f, str) else bytes(f) for f in fragments]
+        self.min_overlap = min_overlap
+        self.max_overlap = max_overlap
+        self.used = bytearray(len(fragments))
+        self.by_prefix = {}
+        for i, fragment in enumerate(self.fragments):
+            if len(fragment) >= min_overlap:
+                self.by_prefix.setdefault(fragment[:min_overlap], []).append(i)
+
+    def mark_used(self, i):
+        """Removes fragment i from the candidates."""
+        self.used[i] = 1
+
+    def best_overlap(self, tail):
+        """(fragment index, overlap length) of the best extension of a contig ending in tail, or (None, 0).
+
+        tail only needs to hold the last max_overlap bases of the contig.
+        """
+        if isinstance(tail, str):
+            tail = tail.encode("ascii")
+        view = memoryview(tail)
+        end = len(view)
+        k = self.min_overlap
+        used = self.used
+        for j in range(min(self.max_overlap, end), k - 1, -1):
+            # a readonly memoryview hashes and compares like the bytes it shows
+            bucket = self.by_prefix.get(view[end - j:end - j + k])
+            if not bucket:
+                continue
+            suffix = view[end - j:]
+            for i in bucket:
+                if not used[i] and self.fragments[i].startswith(suffix):
+                    return i, j
+        return None, 0
+
+
+def greedy_assemble(fragments, min_overlap=MIN_OVERLAP, max_overlap=MAX_OVERLAP, seed=0):
+    """Grows a contig from fragments[seed] to the right until no fragment overlaps it."""
+    index = OverlapIndex(fragments, min_overlap, max_overlap)
+    index.mark_used(seed)
+    contig = bytearray(index.fragments[seed])
+    while True:
+        i, overlap = index.best_overlap(bytes(contig[-max_overlap:]))
+        if i is None:
+            return contig.decode("ascii")
+        contig += memoryview(index.fragments[i])[overlap:]
+        index.mark_used(i)
@@ -0,0 +1,147 @@
+"""
+Overlap graph and greedy layout (Lab5), built in parallel.
+
+The FM-index of the reads is built once; its arrays are then copied into
+shared memory and every worker process maps them as NumPy views, so the reads
+and the index are never pickled. Each worker gets a shard of source reads
+and returns its edges (source, target, overlap length) plus the number of
+occurrences of each of its reads, used to drop reads contained in longer
+ones. The shards are merged and the layout is done in the main process.
+
+The layout is the usual best-overlap greedy: edges are taken longest first,
+and an edge is kept only if its source has no successor yet, its target has
+no predecessor yet and it does not close a cycle. The chains that result are
+the contigs.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bioutils.fmindex import OVERLAP_DTYPE, FMIndex
+from bioutils.overlap import MIN_OVERLAP
+
+SHARDS_PER_WORKER = 4
+
+_worker_index = None
+_worker_memory = []
+
+
+def _share(arrays):
+    """Copies arrays into shared memory: (blocks, specs), specs = {name: (block name, shape, dtype)}."""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs):
+    """Worker initializer: maps the shared arrays and rebuilds the index around them."""
+    global _worker_index
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_memory.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    _worker_index = FMIndex(**arrays)
+
+
+def _shard_overlaps(index, sources, min_overlap):
+    return index.overlaps(min_overlap, sources), index.occurrences(sources)
+
+
+def _worker_overlaps(sources, min_overlap):
+    return _shard_overlaps(_worker_index, sources, min_overlap)
+
+
+def _contained(fragments, occurrences):
+    """True for reads that occur inside a longer read, or repeat an earlier identical read."""
+    copies, first = {}, np.zeros(len(fragments), dtype=bool)
+    for i, fragment in enumerate(fragments):
+        copies[fragment] = copies.get(fragment, 0) + 1
+        first[i] = copies[fragment] == 1
+    identical = np.array([copies[fragment] for fragment in fragments], dtype=np.int64)
+    return (occurrences > identical) | ~first
+
+
+def build_overlap_graph(fragments, min_overlap=MIN_OVERLAP, workers=None):
+    """(edges, contained): all maximal suffix-prefix overlaps and the contained-read mask.
+
+    workers=1 does everything in the current process.
+    """
+    index = FMIndex(fragments)
+    n_reads = len(fragments)
+    workers = workers or os.cpu_count() or 1
+    shards = np.array_split(np.arange(n_reads), max(min(workers * SHARDS_PER_WORKER, n_reads), 1))
+
+    if workers == 1:
+        results = [_shard_overlaps(index, shard, min_overlap) for shard in shards]
+    else:
+        blocks, specs = _share(index.arrays())
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as pool:
+                results = list(pool.map(_worker_overlaps, shards, [min_overlap] * len(shards)))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    edges = np.concatenate([edges for edges, _ in results]) if results else np.empty(0, dtype=OVERLAP_DTYPE)
+    occurrences = np.concatenate([counts for _, counts in results]) if results else np.empty(0, dtype=np.int64)
+    return edges, _contained(fragments, occurrences)
+
+
+def greedy_layout(edges, n_reads, contained=None):
+    """Chains of reads [(read ids, overlaps with the previous read)] from the best-overlap greedy."""
+    if contained is not None:
+        edges = edges[~contained[edges["source"]] & ~contained[edges["target"]]]
+    edges = edges[np.argsort(-edges["length"], kind="stable")]
+
+    successor = np.full(n_reads, -1, dtype=np.int64)
+    predecessor = np.full(n_reads, -1, dtype=np.int64)
+    overlap = np.zeros(n_reads, dtype=np.int64)
+    # union-find over chains, to refuse edges that would close a cycle
+    parent = list(range(n_reads))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for source, target, length in zip(edges["source"].tolist(), edges["target"].tolist(), edges["length"].tolist()):
+        if successor[source] >= 0 or predecessor[target] >= 0:
+            continue
+        root_source, root_target = find(source), find(target)
+        if root_source == root_target:
+            continue
+        parent[root_target] = root_source
+        successor[source], predecessor[target], overlap[target] = target, source, length
+
+    keep = np.ones(n_reads, dtype=bool) if contained is None else ~contained
+    chains = []
+    for head in np.flatnonzero(keep & (predecessor < 0)).tolist():
+        reads, overlaps = [head], [0]
+        while successor[reads[-1]] >= 0:
+            reads.append(int(successor[reads[-1]]))
+            overlaps.append(int(overlap[reads[-1]]))
+        chains.append((reads, overlaps))
+    return chains
+
+
+def layout_contigs(fragments, chains):
+    """Contig sequences of the chains, longest first."""
+    contigs = ["".join(fragments[read][skip:] for read, skip in zip(reads, overlaps)) for reads, overlaps in chains]
+    contigs.sort(key=len, reverse=True)
+    return contigs
+
+
+def overlap_assemble(fragments, min_overlap=MIN_OVERLAP, workers=None):
+    """Overlap-layout assembly: parallel overlap graph, then greedy layout."""
+    edges, contained = build_overlap_graph(fragments, min_overlap, workers)
+    return layout_contigs(fragments, greedy_layout(edges, len(fragments), contained))
@@ -0,0 +1,154 @@
+"""
+Primer candidate search.
+
+Every candidate length is checked at every position of the region with window
+arithmetic on prefix sums, so there is no Python loop over positions:
+
+    GC content     - G+C prefix sum, must fall in gc_range (%)
+    Tm             - nearest-neighbor model by default, or one of the Lab3
+                     composition formulas, must fall in tm_range (°C)
+    GC clamp       - between 1 and 3 G/C among the last 5 bases (3' end)
+    homopolymers   - no run of one base longer than max_homopolymer
+    self-compl.    - no k-mer whose reverse complement also occurs in the
+                     primer (a self-dimer / hairpin seed), found with a
+                     sorted k-mer index instead of comparing all pairs
+
+The result is a NumPy record array with the 0-based start, length, GC% and
+Tm of every candidate that passes, ordered by start then length.
+"""
+
+import numpy as np
+
+from bioutils.encoding import AMBIGUOUS, decode_codes, encode_sequence
+from bioutils.kmers import rolling_kmers
+from bioutils.melting import (NN_NA_PLUS, STRAND_CONC, melting_temperature_alternative,
+                              melting_temperature_simple, tm_nn_profile)
+
+PRIMER_DTYPE = np.dtype([("start", np.int64), ("length", np.int64), ("gc", np.float64), ("tm", np.float64)])
+
+GC_CLAMP_BASES = 5
+SELF_COMPLEMENT_K = 6
+
+
+def _prefix(mask):
+    prefix = np.zeros(len(mask) + 1, dtype=np.int64)
+    np.cumsum(mask, out=prefix[1:])
+    return prefix
+
+
+def _window_sums(prefix, window_size, n_windows, offset=0):
+    """Sum over [s + offset, s + window_size) for every window start s."""
+    return prefix[window_size:window_size + n_windows] - prefix[offset:offset + n_windows]
+
+
+def _left_partners(codes, k):
+    """For every k-mer start j, the closest i <= j whose k-mer is the reverse complement of j's (-1 if none)."""
+    forward, reverse, valid = rolling_kmers(codes, k)
+    n = len(forward)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    positions = np.arange(n, dtype=np.int64)
+    # forward k-mers (invalid ones get -1, which no query can equal) and the
+    # reverse-complement queries sorted together by (k-mer, position), with a
+    # query after the forward k-mer at its own position; a query's partner is
+    # then the last forward entry before it, if that entry holds the same k-mer
+    values = np.concatenate([np.where(valid, forward, -1), reverse])
+    starts = np.concatenate([positions, positions])
+    is_query = np.repeat([False, True], n)
+    order = np.lexsort((is_query, starts, values))
+    entry_rank = np.where(is_query[order], -1, np.arange(2 * n))
+    last_entry = np.maximum.accumulate(entry_rank)
+    query_ranks = np.flatnonzero(is_query[order])
+    before = order[np.maximum(last_entry[query_ranks], 0)]
+    match = (last_entry[query_ranks] >= 0) & (values[before] == values[order[query_ranks]])
+
+    partners = np.full(n, -1, dtype=np.int64)
+    queries = order[query_ranks] - n
+    partners[queries] = np.where(match, starts[before], -1)
+    partners[~valid] = -1
+    return partners
+
+
+def _longest_runs_ending(codes):
+    """Length of the run of identical bases ending at every position."""
+    n = len(codes)
+    change = np.ones(n, dtype=bool)
+    change[1:] = codes[1:] != codes[:-1]
+    run_starts = np.maximum.accumulate(np.where(change, np.arange(n), 0))
+    return np.arange(n) - run_starts + 1
+
+
+def find_primers(sequence, min_len=18, max_len=25, gc_range=(40, 60), tm_range=(55, 62),
+                 tm_method="nearest_neighbor", gc_clamp=True, max_homopolymer=4,
+                 self_complement_k=SELF_COMPLEMENT_K, start=0, end=None,
+                 na_plus=NN_NA_PLUS, strand_conc=STRAND_CONC):
+    """All primer candidates in sequence[start:end] that pass every filter.
+
+    tm_method is "nearest_neighbor", "simple" (4(G+C)+2(A+T)) or "alternative"
+    (81.5 + 16.6 log10[Na+] + 0.41 %GC - 600/length). self_complement_k=None
+    turns the self-complementarity check off.
+    """
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    codes = codes[start:end]
+    n = len(codes)
+
+    gc_prefix = _prefix((codes == 1) | (codes == 2))
+    bad_prefix = _prefix(codes == AMBIGUOUS)
+    long_run_prefix = _prefix(_longest_runs_ending(codes) > max_homopolymer) if n else _prefix(codes)
+    partners = _left_partners(codes, self_complement_k) if self_complement_k else None
+
+    found = []
+    for length in range(min_len, max_len + 1):
+        n_windows = n - length + 1
+        if n_windows <= 0:
+            break
+
+        gc_count = _window_sums(gc_prefix, length, n_windows)
+        gc = gc_count / length * 100
+        keep = (gc >= gc_range[0]) & (gc <= gc_range[1])
+        keep &= _window_sums(bad_prefix, length, n_windows) == 0
+
+        if gc_clamp:
+            clamp = _window_sums(gc_prefix, length, n_windows, length - GC_CLAMP_BASES)
+            keep &= (clamp >= 1) & (clamp <= 3)
+
+        # a run longer than max_homopolymer lies inside the window iff it ends at
+        # a position >= s + max_homopolymer inside the window
+        if max_homopolymer < length:
+            keep &= _window_sums(long_run_prefix, length, n_windows, max_homopolymer) == 0
+
+        if tm_method == "nearest_neighbor":
+            tm = tm_nn_profile(codes, length, 1, na_plus, strand_conc)["tm"]
+        elif tm_method == "simple":
+            tm = melting_temperature_simple(gc_count, 0, length - gc_count, 0).astype(np.float64)
+        elif tm_method == "alternative":
+            tm = melting_temperature_alternative(gc, length, na_plus)
+        else:
+            raise ValueError(f"unknown tm_method '{tm_method}'")
+        keep &= (tm >= tm_range[0]) & (tm <= tm_range[1])
+
+        if partners is not None and length >= self_complement_k:
+            # the window holds a complementary pair iff some k-mer start j in it
+            # has its closest left partner at or after the window start
+            span = length - self_complement_k + 1
+            windows = np.lib.stride_tricks.sliding_window_view(partners, span)[:n_windows]
+            keep &= windows.max(axis=1) < np.arange(n_windows)
+
+        starts = np.flatnonzero(keep)
+        block = np.empty(len(starts), dtype=PRIMER_DTYPE)
+        block["start"] = starts + start
+        block["length"] = length
+        block["gc"] = gc[starts]
+        block["tm"] = tm[starts]
+        found.append(block)
+
+    if not found:
+        return np.empty(0, dtype=PRIMER_DTYPE)
+    primers = np.concatenate(found)
+    return primers[np.lexsort((primers["length"], primers["start"]))]
+
+
+def primer_sequence(sequence, primer):
+    """The sequence of one record returned by find_primers."""
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    return decode_codes(codes[primer["start"]:primer["start"] + primer["length"]])
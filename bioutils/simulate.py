@@ -0,0 +1,186 @@
+"""
+Vectorized read simulator (Lab5).
+
+Reads are drawn in chunks: the start positions, lengths and strands of a
+whole chunk are NumPy arrays, the bases are gathered from the encoded genome
+with one ragged index, and errors are applied to the chunk at once:
+
+    substitutions  - a base is replaced by one of the other three
+    insertions     - a random base is inserted after a base
+    deletions      - a base is dropped
+
+With both_strands=True about half of the reads are reverse complements.
+Chunks can be kept in memory (sample_reads), streamed to FASTQ, or to a
+packed binary file with two bits per base:
+
+    MAGIC | for every chunk: n_reads, n_bases (uint64) | lengths (uint32) | packed bases
+
+Ambiguous genome bases are kept as N in FASTQ but stored as A in the packed
+file.
+
+Usage:
+    python -m bioutils.simulate <genome.fasta> <out.fastq|out.reads> <n_reads> [substitution_rate] [indel_rate]
+"""
+
+import math
+import struct
+import sys
+
+import numpy as np
+
+from bioutils.encoding import AMBIGUOUS, decode_codes, encode_sequence, pack_codes, unpack_codes
+from bioutils.fasta import read_fasta_sequence
+
+MAGIC = b"BIOREAD1"
+CHUNK_READS = 100_000
+MAX_QUALITY = 40
+_CHUNK_HEADER = "<QQ"
+
+
+def _ragged_index(starts, lengths):
+    """Concatenation of arange(start, start + length) for every read."""
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum())) - np.repeat(offsets - starts, lengths)
+
+
+def _read_ids(lengths):
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+
+def _apply_errors(rng, codes, lengths, substitution_rate, insertion_rate, deletion_rate):
+    """(codes, lengths) of a chunk after substitutions, insertions and deletions."""
+    if substitution_rate > 0:
+        hit = (rng.random(len(codes)) < substitution_rate) & (codes != AMBIGUOUS)
+        codes[hit] = (codes[hit] + rng.integers(1, 4, int(hit.sum()), dtype=np.uint8)) % 4
+    if deletion_rate > 0:
+        keep = rng.random(len(codes)) >= deletion_rate
+        lengths = np.bincount(_read_ids(lengths)[keep], minlength=len(lengths))
+        codes = codes[keep]
+    if insertion_rate > 0:
+        inserted = rng.random(len(codes)) < insertion_rate
+        read_ids = _read_ids(lengths)
+        # every base is written once, or twice with the copy replaced by a random base
+        codes = np.repeat(codes, 1 + inserted)
+        new_slots = np.cumsum(1 + inserted) - 1
+        codes[new_slots[inserted]] = rng.integers(0, 4, int(inserted.sum()), dtype=np.uint8)
+        lengths = lengths + np.bincount(read_ids[inserted], minlength=len(lengths))
+    return codes, lengths
+
+
+def simulate_reads(genome, n_reads=None, coverage=None, min_len=100, max_len=150, substitution_rate=0.0,
+                   insertion_rate=0.0, deletion_rate=0.0, both_strands=False, seed=None, chunk_reads=CHUNK_READS):
+    """Yields chunks of simulated reads as dicts of arrays.
+
+    Each chunk has 'codes' (all bases, codes 0-4), 'lengths', 'starts'
+    (0-based, on the forward strand) and 'strands' (+1 / -1). Give either
+    n_reads or coverage (n_reads = coverage * genome length / mean length).
+    """
+    codes = genome if isinstance(genome, np.ndarray) else encode_sequence(genome)
+    size = len(codes)
+    max_len = min(max_len, size)
+    min_len = min(min_len, max_len)
+    if n_reads is None:
+        if coverage is None:
+            raise ValueError("give n_reads or coverage")
+        n_reads = int(math.ceil(coverage * size / ((min_len + max_len) / 2)))
+    rng = np.random.default_rng(seed)
+
+    for first in range(0, n_reads, chunk_reads):
+        count = min(chunk_reads, n_reads - first)
+        lengths = rng.integers(min_len, max_len + 1, count)
+        starts = rng.integers(0, size - lengths + 1)
+        strands = np.where(rng.random(count) < 0.5, -1, 1) if both_strands else np.ones(count, dtype=np.int64)
+
+        index = _ragged_index(starts, lengths)
+        reverse = np.repeat(strands < 0, lengths)
+        if reverse.any():
+            # position i of a reverse read takes base (end - 1 - i) of its window
+            read_starts = np.repeat(starts, lengths)
+            index[reverse] = 2 * read_starts[reverse] + np.repeat(lengths, lengths)[reverse] - 1 - index[reverse]
+        bases = codes[index]
+        bases[reverse] = np.where(bases[reverse] < AMBIGUOUS, 3 - bases[reverse], AMBIGUOUS)
+
+        bases, lengths = _apply_errors(rng, bases, lengths, substitution_rate, insertion_rate, deletion_rate)
+        yield {"codes": bases, "lengths": lengths, "starts": starts, "strands": strands}
+
+
+def chunk_sequences(chunk):
+    """Read strings of one chunk."""
+    text = decode_codes(chunk["codes"])
+    ends = np.cumsum(chunk["lengths"]).tolist()
+    return [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+
+def sample_reads(genome, n_reads, min_len=100, max_len=150, **options):
+    """All simulated reads as a list of strings (see simulate_reads for the options)."""
+    reads = []
+    for chunk in simulate_reads(genome, n_reads, min_len=min_len, max_len=max_len, **options):
+        reads.extend(chunk_sequences(chunk))
+    return reads
+
+
+def _quality_char(error_rate):
+    quality = MAX_QUALITY if error_rate <= 0 else min(MAX_QUALITY, int(-10 * math.log10(error_rate)))
+    return chr(33 + quality)
+
+
+def write_fastq(chunks, path, error_rate=0.0, prefix="read"):
+    """Streams chunks to a FASTQ file; every base gets the Phred quality of error_rate."""
+    quality = _quality_char(error_rate)
+    count = 0
+    with open(path, "w") as out:
+        for chunk in chunks:
+            lines = []
+            for sequence, start, strand in zip(chunk_sequences(chunk), chunk["starts"].tolist(),
+                                               chunk["strands"].tolist()):
+                count += 1
+                lines.append(f"@{prefix}{count} {start + 1}{'+' if strand > 0 else '-'}\n{sequence}\n+\n"
+                             f"{quality * len(sequence)}\n")
+            out.write("".join(lines))
+    return count
+
+
+def write_packed_reads(chunks, path):
+    """Streams chunks to a packed 2-bit read file; returns the number of reads."""
+    count = 0
+    with open(path, "wb") as out:
+        out.write(MAGIC)
+        for chunk in chunks:
+            lengths = chunk["lengths"]
+            out.write(struct.pack(_CHUNK_HEADER, len(lengths), len(chunk["codes"])))
+            out.write(lengths.astype("<u4").tobytes())
+            out.write(pack_codes(chunk["codes"]).tobytes())
+            count += len(lengths)
+    return count
+
+
+def read_packed_reads(path):
+    """Yields (codes, lengths) for every chunk of a packed read file."""
+    header_size = struct.calcsize(_CHUNK_HEADER)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a packed read file")
+        while True:
+            header = f.read(header_size)
+            if not header:
+                return
+            n_reads, n_bases = struct.unpack(_CHUNK_HEADER, header)
+            lengths = np.frombuffer(f.read(4 * n_reads), dtype="<u4").astype(np.int64)
+            packed = np.frombuffer(f.read((n_bases + 3) // 4), dtype=np.uint8)
+            yield unpack_codes(packed, n_bases), lengths
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python -m bioutils.simulate <genome.fasta> <out.fastq|out.reads> <n_reads> "
+              "[substitution_rate] [indel_rate]")
+        sys.exit(1)
+    substitutions = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    indels = float(sys.argv[5]) if len(sys.argv) > 5 else 0.0
+    chunks = simulate_reads(read_fasta_sequence(sys.argv[1]), int(sys.argv[3]), substitution_rate=substitutions,
+                            insertion_rate=indels / 2, deletion_rate=indels / 2, both_strands=True)
+    if sys.argv[2].endswith((".fastq", ".fq")):
+        written = write_fastq(chunks, sys.argv[2], substitutions + indels)
+    else:
+        written = write_packed_reads(chunks, sys.argv[2])
+    print(f"Wrote {written} reads to {sys.argv[2]}")
@@ -0,0 +1,146 @@
+"""
+Bounded-memory streaming k-mer counting.
+
+Exact counters keep one entry per distinct k-mer, which does not fit in RAM
+for large k on large assemblies. Here the counts go into a count-min sketch:
+`depth` rows of `width` counters, each row with its own hash of the k-mer.
+A k-mer's estimate is the minimum of its counters, which never undercounts.
+With N k-mers counted in total, for any single k-mer
+
+    true count <= estimate <= true count + epsilon * N
+
+holds with probability at least 1 - delta, where epsilon = e / width and
+delta = exp(-depth). Next to the sketch a small heavy-hitter table keeps the
+`heavy_hitters` k-mers with the highest estimates, which gives approximate
+top-k frequencies.
+
+The input is streamed with read_fasta_chunks, so the memory used is the
+sketch, the table and one block of sequence, whatever the file size.
+
+Usage:
+    python -m bioutils.sketch genome.fasta.gz 21 [top]
+"""
+
+import math
+import sys
+
+import numpy as np
+
+from bioutils.encoding import encode_sequence
+from bioutils.fasta import read_fasta_chunks
+from bioutils.kmers import decode_kmer, kmer_values
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DEPTH = 4
+DEFAULT_HEAVY_HITTERS = 1000
+
+
+class CountMinSketch:
+    """Count-min sketch over k-mer numbers with a heavy-hitter table."""
+
+    def __init__(self, k, memory_bytes=DEFAULT_MEMORY_BYTES, depth=DEFAULT_DEPTH,
+                 heavy_hitters=DEFAULT_HEAVY_HITTERS, seed=0, canonical=False):
+        if memory_bytes < depth * 4 * 16:
+            raise ValueError("memory budget too small for the sketch")
+        self.k = k
+        self.canonical = canonical
+        self.depth = depth
+        # width is a power of two so that a row index is the top bits of a 64-bit hash
+        self.width_bits = int(math.log2(memory_bytes // (depth * 4)))
+        self.width = 1 << self.width_bits
+        self.table = np.zeros((depth, self.width), dtype=np.uint32)
+        self.total = 0
+
+        rng = np.random.default_rng(seed)
+        self._mult = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) * 2 + 1
+        self._add = rng.integers(0, 2 ** 63, size=depth, dtype=np.uint64)
+
+        self.heavy_hitters = heavy_hitters
+        self._hh_keys = np.empty(0, dtype=np.int64)
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+
+    def error_bound(self):
+        """Maximum overcount (epsilon * N) that holds with probability 1 - delta."""
+        return self.epsilon * self.total
+
+    def _rows(self, kmers):
+        """Counter index of every k-mer in every row, shape (depth, len(kmers))."""
+        x = kmers.astype(np.uint64)
+        with np.errstate(over="ignore"):
+            hashed = x[None, :] * self._mult[:, None] + self._add[:, None]
+        return (hashed >> np.uint64(64 - self.width_bits)).astype(np.int64)
+
+    def estimate_values(self, kmers):
+        """Estimated counts of an array of k-mer numbers."""
+        kmers = np.asarray(kmers, dtype=np.int64)
+        rows = self._rows(kmers)
+        return self.table[np.arange(self.depth)[:, None], rows].min(axis=0)
+
+    def estimate(self, kmer):
+        """Estimated count of one k-mer string (k letters from ACGT)."""
+        if len(kmer) != self.k or (encode_sequence(kmer) > 3).any():
+            raise ValueError(f"{kmer!r} is not a {self.k}-mer over ACGT")
+        return int(self.estimate_values(kmer_values(kmer, self.k, self.canonical))[0])
+
+    def add_values(self, values):
+        """Adds an array of k-mer numbers (one occurrence per element)."""
+        if len(values) == 0:
+            return
+        kmers, counts = np.unique(values, return_counts=True)
+        rows = self._rows(kmers)
+        for r in range(self.depth):
+            # several k-mers can share a counter, so sum them per counter first
+            counters, inverse = np.unique(rows[r], return_inverse=True)
+            added = np.bincount(inverse, weights=counts).astype(np.uint64)
+            row = self.table[r]
+            row[counters] = np.minimum(row[counters] + added, np.iinfo(np.uint32).max)
+        self.total += len(values)
+        self._update_heavy_hitters(kmers)
+
+    def _update_heavy_hitters(self, kmers):
+        candidates = np.union1d(self._hh_keys, kmers)
+        estimates = self.estimate_values(candidates)
+        if len(candidates) > self.heavy_hitters:
+            keep = np.argpartition(estimates, -self.heavy_hitters)[-self.heavy_hitters:]
+            candidates = candidates[keep]
+        self._hh_keys = candidates
+
+    def top_kmers(self, n=10):
+        """The n most frequent k-mers seen so far, as (kmer, estimated count)."""
+        estimates = self.estimate_values(self._hh_keys)
+        order = np.argsort(-estimates.astype(np.int64), kind="stable")[:n]
+        return [(decode_kmer(int(self._hh_keys[i]), self.k), int(estimates[i])) for i in order]
+
+
+def sketch_fasta(filepath, k, memory_bytes=DEFAULT_MEMORY_BYTES, depth=DEFAULT_DEPTH,
+                 heavy_hitters=DEFAULT_HEAVY_HITTERS, canonical=False):
+    """Streams a (possibly compressed) FASTA file into a CountMinSketch."""
+    sketch = CountMinSketch(k, memory_bytes, depth, heavy_hitters, canonical=canonical)
+    carry = np.empty(0, dtype=np.uint8)
+    for _, piece, first in read_fasta_chunks(filepath):
+        codes = encode_sequence(piece)
+        if not first:
+            # k-mers spanning two pieces of the same record
+            codes = np.concatenate([carry, codes])
+        sketch.add_values(kmer_values(codes, k, canonical))
+        carry = codes[max(0, len(codes) - (k - 1)):]
+    return sketch
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m bioutils.sketch <file.fasta> <k> [top]")
+        sys.exit(1)
+    top = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    result = sketch_fasta(sys.argv[1], int(sys.argv[2]))
+    print(f"{result.total} k-mers, overcount <= {result.error_bound():.1f} "
+          f"with probability {1 - result.delta:.3f}")
+    for kmer, count in result.top_kmers(top):
+        print(f"{kmer}\t{count}")
@@ -0,0 +1,210 @@
+"""
+2-bit packed genome store.
+
+A FASTA file is converted once into a binary file where every base takes two
+bits (A=0, C=1, G=2, T=3). N and the other ambiguity letters are packed as A
+and remembered in a side mask of runs (start, length, letter), so the original
+sequence can always be restored.
+
+Layout of the file:
+    MAGIC | packed bases of every record | JSON index | index offset (uint64)
+
+The store is opened with mmap and exposed as NumPy uint8 views, so opening it
+costs nothing, nothing is copied until a region is unpacked, and several
+processes reading the same store share one page-cached copy.
+
+open_genome_store(fasta) keeps the store next to the FASTA file as
+<fasta>.2bit and rebuilds it when the FASTA file is newer, the same way the
+.fai index is handled.
+
+Usage:
+    python -m bioutils.store genome.fasta genome.2bit
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+from bioutils.encoding import AMBIGUOUS, decode_codes, encode_sequence, pack_codes, unpack_codes
+from bioutils.fasta import read_fasta_records
+
+MAGIC = b"BIO2BIT1"
+_OFFSET_FORMAT = "<Q"
+_OFFSET_SIZE = struct.calcsize(_OFFSET_FORMAT)
+
+
+def _ambiguity_runs(raw, codes):
+    """Returns [start, length, letter] for every run of one ambiguity letter."""
+    positions = np.flatnonzero(codes == AMBIGUOUS)
+    if len(positions) == 0:
+        return []
+    letters = raw[positions]
+    breaks = (np.diff(positions) != 1) | (np.diff(letters) != 0)
+    run_starts = np.concatenate([[0], np.flatnonzero(breaks) + 1])
+    run_ends = np.concatenate([run_starts[1:], [len(positions)]])
+    return [
+        [int(positions[s]), int(e - s), chr(letters[s])]
+        for s, e in zip(run_starts, run_ends)
+    ]
+
+
+def build_genome_store(fasta_path, store_path):
+    """Converts a FASTA file into a 2-bit packed store and returns its path.
+
+    The store is written to a temporary file in the same folder and moved into
+    place at the end, so an interrupted build never leaves a truncated store.
+    """
+    default_name = os.path.splitext(os.path.basename(fasta_path))[0]
+    records = []
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(store_path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(MAGIC)
+            offset = 0
+            for record_id, description, sequence in read_fasta_records(fasta_path):
+                raw = np.frombuffer(sequence.upper().encode("ascii", "replace"), dtype=np.uint8)
+                codes = encode_sequence(raw.tobytes())
+                packed = pack_codes(codes)
+                out.write(packed.tobytes())
+
+                name = record_id or default_name
+                if any(r["name"] == name for r in records):
+                    name = f"{name}_{len(records) + 1}"
+                records.append({
+                    "name": name,
+                    "description": description,
+                    "length": len(codes),
+                    "offset": offset,
+                    "mask": _ambiguity_runs(raw, codes),
+                })
+                offset += len(packed)
+
+            index_start = len(MAGIC) + offset
+            out.write(json.dumps({"records": records}).encode("utf-8"))
+            out.write(struct.pack(_OFFSET_FORMAT, index_start))
+        os.replace(tmp_path, store_path)  # atomic, safe with parallel builds
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return store_path
+
+
+def _store_path(fasta_path):
+    return fasta_path + ".2bit"
+
+
+def open_genome_store(fasta_path):
+    """Opens the store next to a FASTA file, building it when missing or stale."""
+    store_path = _store_path(fasta_path)
+    if not os.path.exists(store_path) or os.path.getmtime(store_path) < os.path.getmtime(fasta_path):
+        build_genome_store(fasta_path, store_path)
+        return GenomeStore(store_path)
+    try:
+        return GenomeStore(store_path)
+    except ValueError:
+        # left behind by an older, interrupted build
+        build_genome_store(fasta_path, store_path)
+        return GenomeStore(store_path)
+
+
+class GenomeStore:
+    """Read-only, memory-mapped view of a file made by build_genome_store."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a genome store")
+
+        try:
+            index_start = struct.unpack(_OFFSET_FORMAT, self._mmap[-_OFFSET_SIZE:])[0]
+            index = json.loads(self._mmap[index_start:-_OFFSET_SIZE].decode("utf-8"))
+        except (struct.error, ValueError):
+            self.close()
+            raise ValueError(f"{path} is a truncated genome store")
+        self.records = {r["name"]: r for r in index["records"]}
+        self._data = np.frombuffer(self._mmap, dtype=np.uint8, count=index_start - len(MAGIC), offset=len(MAGIC))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the mapping (views returned by packed() must be gone)."""
+        self._data = None
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    @property
+    def names(self):
+        return list(self.records)
+
+    def length(self, name):
+        return self.records[name]["length"]
+
+    def packed(self, name):
+        """Zero-copy uint8 view of the packed bases of one record."""
+        record = self.records[name]
+        start = record["offset"]
+        return self._data[start:start + (record["length"] + 3) // 4]
+
+    def ambiguity_runs(self, name):
+        """List of [start, length, letter] runs of non-ACGT symbols."""
+        return self.records[name]["mask"]
+
+    def codes(self, name, start=0, end=None, mask=True):
+        """Unpacks a region into codes 0-3, with ambiguous positions set to 4."""
+        length = self.length(name)
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if end <= start:
+            return np.empty(0, dtype=np.uint8)
+        codes = unpack_codes(self.packed(name), end - start, start)
+        if mask:
+            for run_start, run_length, _ in self.ambiguity_runs(name):
+                lo, hi = max(run_start, start), min(run_start + run_length, end)
+                if lo < hi:
+                    codes[lo - start:hi - start] = AMBIGUOUS
+        return codes
+
+    def sequence(self, name, start=0, end=None):
+        """Decodes a region back into a string, restoring the ambiguity letters."""
+        length = self.length(name)
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        letters = bytearray(decode_codes(self.codes(name, start, end, mask=False)).encode("ascii"))
+        for run_start, run_length, letter in self.ambiguity_runs(name):
+            lo, hi = max(run_start, start), min(run_start + run_length, end)
+            if lo < hi:
+                letters[lo - start:hi - start] = letter.encode("ascii") * (hi - lo)
+        return letters.decode("ascii")
+
+    def joined_codes(self):
+        """Codes of all records concatenated, like read_fasta_sequence does for text."""
+        if len(self.records) == 1:
+            return self.codes(self.names[0])
+        if not self.records:
+            return np.empty(0, dtype=np.uint8)
+        return np.concatenate([self.codes(name) for name in self.names])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m bioutils.store <input.fasta> <output.2bit>")
+        sys.exit(1)
+    build_genome_store(sys.argv[1], sys.argv[2])
+    with GenomeStore(sys.argv[2]) as store:
+        for store_name in store.names:
+            print(f"{store_name}: {store.length(store_name)} bp, {len(store.ambiguity_runs(store_name))} ambiguity runs")
@@ -0,0 +1,257 @@
+"""
+Codon translation through a 64-entry lookup table.
+
+The sequence is encoded once and every codon becomes a number 0-63 (base 4,
+first base most significant, in the A C G T order of bioutils.encoding), so a
+whole frame is translated with one array lookup. Codons with an ambiguous base
+get the index 64, which translates to X.
+
+Every NCBI translation table is written as the 64-letter amino-acid and
+start-codon strings NCBI uses (T C A G codon order) and compiled into lookup
+arrays once, at import; the functions select one with table_id (1 = standard,
+2 = vertebrate mitochondrial, 4 = mycoplasma, 11 = bacterial, ...).
+"""
+
+import numpy as np
+
+from bioutils.encoding import encode_sequence
+from bioutils.kmers import rolling_kmers
+
+NCBI_ORDER = "TCAG"
+UNKNOWN_CODON = 64
+STOP = "*"
+
+THREE_LETTER = {
+    "A": "Ala", "R": "Arg", "N": "Asn", "D": "Asp", "C": "Cys", "Q": "Gln", "E": "Glu",
+    "G": "Gly", "H": "His", "I": "Ile", "L": "Leu", "K": "Lys", "M": "Met", "F": "Phe",
+    "P": "Pro", "S": "Ser", "T": "Thr", "W": "Trp", "Y": "Tyr", "V": "Val",
+    "*": "Stop", "X": "Xaa",
+}
+
+NCBI_CODES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "--------------------------------MMMM---------------M------------"),
+    3: ("Yeast Mitochondrial",
+        "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "----------------------------------MM---------------M------------"),
+    4: ("Mold Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM---------------M------------MMMM---------------M------------"),
+    5: ("Invertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+        "---M----------------------------MMMM---------------M------------"),
+    6: ("Ciliate Nuclear",
+        "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    9: ("Echinoderm Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    10: ("Euplotid Nuclear",
+        "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    11: ("Bacterial",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear",
+        "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-------------------M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+        "---M------------------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial",
+        "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    15: ("Blepharisma Macronuclear",
+        "FFLLSSSSYY*QCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    16: ("Chlorophycean Mitochondrial",
+        "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    21: ("Trematode Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    22: ("Scenedesmus obliquus Mitochondrial",
+        "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    23: ("Thraustochytrium Mitochondrial",
+        "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--------------------------------M--M---------------M------------"),
+    24: ("Pterobranchia Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M---------------M------------"),
+    25: ("Candidate Division SR1",
+        "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M-------------------------------M---------------M------------"),
+    26: ("Pachysolen tannophilus Nuclear",
+        "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-------------------M---------------M----------------------------"),
+    27: ("Karyorelict Nuclear",
+        "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    28: ("Condylostoma Nuclear",
+        "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    29: ("Mesodinium Nuclear",
+        "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    30: ("Peritrich Nuclear",
+        "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    31: ("Blastocrithidia Nuclear",
+        "FFLLSSSSYYEECCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    32: ("Balanophoraceae Plastid",
+        "FFLLSSSSYY*WCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M------------MMMM---------------M------------"),
+    33: ("Cephalodiscidae Mitochondrial",
+        "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M---------------M------------"),
+}
+
+ORF_DTYPE = np.dtype([("start", np.int64), ("stop", np.int64), ("frame", np.int8), ("length", np.int64)])
+
+
+def codon_index(codon):
+    """Number 0-63 of a three-letter codon (DNA or RNA)."""
+    a, b, c = encode_sequence(codon.upper())
+    return 16 * int(a) + 4 * int(b) + int(c)
+
+
+def codon_table(amino_acids):
+    """65-entry uint8 lookup (ASCII letters) from a 64-letter table in NCBI order."""
+    table = np.full(UNKNOWN_CODON + 1, ord("X"), dtype=np.uint8)
+    for i, aa in enumerate(amino_acids):
+        codon = NCBI_ORDER[i // 16] + NCBI_ORDER[i // 4 % 4] + NCBI_ORDER[i % 4]
+        table[codon_index(codon)] = ord(aa)
+    return table
+
+
+def start_codon_mask(starts):
+    """65-entry boolean lookup of the start codons marked 'M' in an NCBI start string."""
+    mask = np.zeros(UNKNOWN_CODON + 1, dtype=bool)
+    for i, flag in enumerate(starts):
+        if flag == "M":
+            mask[codon_index(NCBI_ORDER[i // 16] + NCBI_ORDER[i // 4 % 4] + NCBI_ORDER[i % 4])] = True
+    return mask
+
+
+TABLES = {table_id: codon_table(code[1]) for table_id, code in NCBI_CODES.items()}
+START_MASKS = {table_id: start_codon_mask(code[2]) for table_id, code in NCBI_CODES.items()}
+for _compiled in list(TABLES.values()) + list(START_MASKS.values()):
+    _compiled.flags.writeable = False
+STANDARD_TABLE = TABLES[1]
+
+
+def get_table(table_id=1):
+    """Compiled amino-acid lookup of an NCBI translation table."""
+    try:
+        return TABLES[table_id]
+    except KeyError:
+        raise ValueError(f"unknown genetic code table {table_id}") from None
+
+
+def _all_codons(codes, with_reverse):
+    """Codon index starting at every position (forward strand, and reverse complement)."""
+    forward, reverse, valid = rolling_kmers(codes, 3, with_reverse=with_reverse)
+    forward = np.where(valid, forward, UNKNOWN_CODON)
+    if with_reverse:
+        # reverse[i] is the reverse complement of codes[i:i+3]; reversed, it is
+        # the codon at every position of the reverse complement strand
+        reverse = np.where(valid, reverse, UNKNOWN_CODON)[::-1]
+    return forward, reverse
+
+
+def codon_indices(sequence, frame=0):
+    """Codon numbers of one forward reading frame (0, 1 or 2)."""
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    forward, _ = _all_codons(codes, with_reverse=False)
+    return forward[frame::3]
+
+
+def _letters(codons, table, to_stop):
+    protein = table[codons].tobytes().decode("ascii")
+    return protein.split(STOP, 1)[0] if to_stop else protein
+
+
+def translate(sequence, frame=0, table_id=1, to_stop=False):
+    """Protein of one forward frame; stops are '*' (or the protein ends there with to_stop)."""
+    return _letters(codon_indices(sequence, frame), get_table(table_id), to_stop)
+
+
+def six_frame_translation(sequence, table_id=1):
+    """Proteins of the six reading frames, keyed +1, +2, +3, -1, -2, -3."""
+    table = get_table(table_id)
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    forward, reverse = _all_codons(codes, with_reverse=True)
+    frames = {}
+    for frame in range(3):
+        frames[frame + 1] = _letters(forward[frame::3], table, False)
+    for frame in range(3):
+        frames[-(frame + 1)] = _letters(reverse[frame::3], table, False)
+    return frames
+
+
+def _strand_orfs(codons, table, start_mask, min_length):
+    """(first codon, stop codon, frame) of every ORF on one strand, in strand coordinates."""
+    is_stop = table[codons] == ord(STOP)
+    is_start = start_mask[codons]
+    found = []
+    for frame in range(3):
+        starts = np.flatnonzero(is_start[frame::3])
+        stops = np.flatnonzero(is_stop[frame::3])
+        # the ORF ending at each stop begins at the first start after the previous stop
+        previous = np.concatenate([[-1], stops[:-1]])
+        first = np.searchsorted(starts, previous + 1)
+        has_start = first < len(starts)
+        first_start = starts[np.minimum(first, len(starts) - 1)] if len(starts) else previous
+        keep = has_start & (first_start < stops) & (stops - first_start >= min_length)
+        found.append((first_start[keep] * 3 + frame, stops[keep] * 3 + frame + 3, frame, stops[keep] - first_start[keep]))
+    return found
+
+
+def find_orfs(sequence, min_length=0, start_codons=("ATG",), table_id=1):
+    """Every ORF on both strands as ORF_DTYPE records, ordered by start.
+
+    An ORF runs from the first start codon after a stop to the next in-frame
+    stop. start and stop are 0-based forward-strand coordinates, stop exclusive
+    and including the stop codon; frame is +1..+3 or -1..-3; length is the
+    number of amino acids (min_length filters on it). start_codons=None uses
+    every start codon of the table (e.g. TTG and CTG too in table 1).
+    """
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    n = len(codes)
+    forward, reverse = _all_codons(codes, with_reverse=True)
+    table = get_table(table_id)
+    if start_codons is None:
+        start_mask = START_MASKS[table_id]
+    else:
+        start_mask = np.zeros(UNKNOWN_CODON + 1, dtype=bool)
+        start_mask[[codon_index(codon) for codon in start_codons]] = True
+
+    blocks = []
+    for strand, codons in ((1, forward), (-1, reverse)):
+        for begin, end, frame, length in _strand_orfs(codons, table, start_mask, min_length):
+            block = np.empty(len(begin), dtype=ORF_DTYPE)
+            if strand == 1:
+                block["start"], block["stop"] = begin, end
+            else:
+                block["start"], block["stop"] = n - end, n - begin
+            block["frame"] = strand * (frame + 1)
+            block["length"] = length
+            blocks.append(block)
+
+    orfs = np.concatenate(blocks)
+    return orfs[np.argsort(orfs["start"], kind="stable")]
+
+
+def orf_protein(sequence, orf, table_id=1):
+    """Protein (without the stop) encoded by one record returned by find_orfs."""
+    codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+    region = codes[orf["start"]:orf["stop"]]
+    if orf["frame"] < 0:
+        region = np.where(region[::-1] < 4, 3 - region[::-1], region[::-1])
+    return translate(region, 0, table_id, to_stop=True)